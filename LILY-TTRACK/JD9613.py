@@ -1,90 +1,115 @@
-CMD = [
-    (0xFE, [0x01], 0x02),
-    (0xF7, [0x96, 0x13, 0xA9], 0x04),
-    (0x90, [0x01], 0x02),
-    (0x2C, [0x19, 0x0B, 0x24, 0x1B, 0x1B, 0x1B, 0xAA, 0x50, 0x01, 0x16, 0x04, 0x04, 0x04, 0xD7], 0x0F),
-    (0x2D, [0x66, 0x56, 0x55], 0x04),
-    (0x2E, [0x24, 0x04, 0x3F, 0x30, 0x30, 0xA8, 0xB8, 0xB8, 0x07], 0x0A),
-    (0x33, [0x03, 0x03, 0x03, 0x19, 0x19, 0x19, 0x13, 0x13, 0x13, 0x1A, 0x1A, 0x1A], 0x0D),
-    (0x10, [0x0B, 0x08, 0x64, 0xAE, 0x0B, 0x08, 0x64, 0xAE, 0x00, 0x80, 0x00, 0x00, 0x01], 0x0E),
-    (0x11, [0x01, 0x1E, 0x01, 0x1E, 0x00], 0x06),
-    (0x03, [0x93, 0x1C, 0x00, 0x01, 0x7E], 0x06),
-    (0x19, [0x00], 0x02),
-    (0x31, [0x1B, 0x00, 0x06, 0x05, 0x05, 0x05], 0x07),
-    (0x35, [0x00, 0x80, 0x80, 0x00], 0x05),
-    (0x12, [0x1B], 0x02),
-    (0x1A, [0x01, 0x20, 0x00, 0x08, 0x01, 0x06, 0x06, 0x06], 0x09),
-    (0x74, [0xBD, 0x00, 0x01, 0x08, 0x01, 0xBB, 0x98], 0x08),
-    (0x6C, [0xDC, 0x08, 0x02, 0x01, 0x08, 0x01, 0x30, 0x08, 0x00], 0x0A),
-    (0x6D, [0xDC, 0x08, 0x02, 0x01, 0x08, 0x02, 0x30, 0x08, 0x00], 0x0A),
-    (0x76, [0xDA, 0x00, 0x02, 0x20, 0x39, 0x80, 0x80, 0x50, 0x05], 0x0A),
-    (0x6E, [0xDC, 0x00, 0x02, 0x01, 0x00, 0x02, 0x4F, 0x02, 0x00], 0x0A),
-    (0x6F, [0xDC, 0x00, 0x02, 0x01, 0x00, 0x01, 0x4F, 0x02, 0x00], 0x0A),
-    (0x80, [0xBD, 0x00, 0x01, 0x08, 0x01, 0xBB, 0x98], 0x08),
-    (0x78, [0xDC, 0x08, 0x02, 0x01, 0x08, 0x01, 0x30, 0x08, 0x00], 0x0A),
-    (0x79, [0xDC, 0x08, 0x02, 0x01, 0x08, 0x02, 0x30, 0x08, 0x00], 0x0A),
-    (0x82, [0xDA, 0x40, 0x02, 0x20, 0x39, 0x00, 0x80, 0x50, 0x05], 0x0A),
-    (0x7A, [0xDC, 0x00, 0x02, 0x01, 0x00, 0x02, 0x4F, 0x02, 0x00], 0x0A),
-    (0x7B, [0xDC, 0x00, 0x02, 0x01, 0x00, 0x01, 0x4F, 0x02, 0x00], 0x0A),
-    (0x84, [0x01, 0x00, 0x09, 0x19, 0x19, 0x19, 0x19, 0x19, 0x19, 0x19], 0x0B),
-    (0x85, [0x19, 0x19, 0x19, 0x03, 0x02, 0x08, 0x19, 0x19, 0x19, 0x19], 0x0B),
-    (0x20, [0x20, 0x00, 0x08, 0x00, 0x02, 0x00, 0x40, 0x00, 0x10, 0x00, 0x04, 0x00], 0x0D),
-    (0x1E, [0x40, 0x00, 0x10, 0x00, 0x04, 0x00, 0x20, 0x00, 0x08, 0x00, 0x02, 0x00], 0x0D),
-    (0x24, [0x20, 0x00, 0x08, 0x00, 0x02, 0x00, 0x40, 0x00, 0x10, 0x00, 0x04, 0x00], 0x0D),
-    (0x22, [0x40, 0x00, 0x10, 0x00, 0x04, 0x00, 0x20, 0x00, 0x08, 0x00, 0x02, 0x00], 0x0D),
-    (0x13, [0x63, 0x52, 0x41], 0x04),
-    (0x14, [0x36, 0x25, 0x14], 0x04),
-    (0x15, [0x63, 0x52, 0x41], 0x04),
-    (0x16, [0x36, 0x25, 0x14], 0x04),
-    (0x1D, [0x10, 0x00, 0x00], 0x04),
-    (0x2A, [0x0D, 0x07], 0x03),
-    (0x27, [0x00, 0x01, 0x02, 0x03, 0x04, 0x05], 0x07),
-    (0x28, [0x00, 0x01, 0x02, 0x03, 0x04, 0x05], 0x07),
-    (0x26, [0x01, 0x01], 0x03),
-    (0x86, [0x01, 0x01], 0x03),
-    (0xFE, [0x02], 0x02),
-    (0x16, [0x81, 0x43, 0x23, 0x1E, 0x03], 0x06),
-    (0xFE, [0x03], 0x02),
-    (0x60, [0x01], 0x02),
-    (0x61, [0x00, 0x00, 0x00, 0x00, 0x11, 0x00, 0x0D, 0x26, 0x5A, 0x80, 0x80, 0x95, 0xF8, 0x3B, 0x75], 0x10),
-    (0x62, [0x21, 0x22, 0x32, 0x43, 0x44, 0xD7, 0x0A, 0x59, 0xA1, 0xE1, 0x52, 0xB7, 0x11, 0x64, 0xB1], 0x10),
-    (0x63, [0x54, 0x55, 0x66, 0x06, 0xFB, 0x3F, 0x81, 0xC6, 0x06, 0x45, 0x83], 0x0C),
-    (0x64, [0x00, 0x00, 0x11, 0x11, 0x21, 0x00, 0x23, 0x6A, 0xF8, 0x63, 0x67, 0x70, 0xA5, 0xDC, 0x02], 0x10),
-    (0x65, [0x22, 0x22, 0x32, 0x43, 0x44, 0x24, 0x44, 0x82, 0xC1, 0xF8, 0x61, 0xBF, 0x13, 0x62, 0xAD], 0x10),
-    (0x66, [0x54, 0x55, 0x65, 0x06, 0xF5, 0x37, 0x76, 0xB8, 0xF5, 0x31, 0x6C], 0x0C),
-    (0x67, [0x00, 0x10, 0x22, 0x22, 0x22, 0x00, 0x37, 0xA4, 0x7E, 0x22, 0x25, 0x2C, 0x4C, 0x72, 0x9A], 0x10),
-    (0x68, [0x22, 0x33, 0x43, 0x44, 0x55, 0xC1, 0xE5, 0x2D, 0x6F, 0xAF, 0x23, 0x8F, 0xF3, 0x50, 0xA6], 0x10),
-    (0x69, [0x65, 0x66, 0x77, 0x07, 0xFD, 0x4E, 0x9C, 0xED, 0x39, 0x86, 0xD3], 0x0C),
-    (0xFE, [0x05], 0x02),
-    (0x61, [0x00, 0x31, 0x44, 0x54, 0x55, 0x00, 0x92, 0xB5, 0x88, 0x19, 0x90, 0xE8, 0x3E, 0x71, 0xA5], 0x10),
-    (0x62, [0x55, 0x66, 0x76, 0x77, 0x88, 0xCE, 0xF2, 0x32, 0x6E, 0xC4, 0x34, 0x8B, 0xD9, 0x2A, 0x7D], 0x10),
-    (0x63, [0x98, 0x99, 0xAA, 0x0A, 0xDC, 0x2E, 0x7D, 0xC3, 0x0D, 0x5B, 0x9E], 0x0C),
-    (0x64, [0x00, 0x31, 0x44, 0x54, 0x55, 0x00, 0xA2, 0xE5, 0xCD, 0x5C, 0x94, 0xCF, 0x09, 0x4A, 0x72], 0x10),
-    (0x65, [0x55, 0x65, 0x66, 0x77, 0x87, 0x9C, 0xC2, 0xFF, 0x36, 0x6A, 0xEC, 0x45, 0x91, 0xD8, 0x20], 0x10),
-    (0x66, [0x88, 0x98, 0x99, 0x0A, 0x68, 0xB0, 0xFB, 0x43, 0x8C, 0xD5, 0x0E], 0x0C),
-    (0x67, [0x00, 0x42, 0x55, 0x55, 0x55, 0x00, 0xCB, 0x62, 0xC5, 0x09, 0x44, 0x72, 0xA9, 0xD6, 0xFD], 0x10),
-    (0x68, [0x66, 0x66, 0x77, 0x87, 0x98, 0x21, 0x45, 0x96, 0xED, 0x29, 0x90, 0xEE, 0x4B, 0xB1, 0x13], 0x10),
-    (0x69, [0x99, 0xAA, 0xBA, 0x0B, 0x6A, 0xB8, 0x0D, 0x62, 0xB8, 0x0E, 0x54], 0x0C),
-    (0xFE, [0x07], 0x02),
-    (0x3E, [0x00], 0x02),
-    (0x42, [0x03, 0x10], 0x03),
-    (0x4A, [0x31], 0x02),
-    (0x5C, [0x01], 0x02),
-    (0x3C, [0x07, 0x00, 0x24, 0x04, 0x3F, 0xE2], 0x07),
-    (0x44, [0x03, 0x40, 0x3F, 0x02], 0x05),
-    (0x12, [0xAA, 0xAA, 0xC0, 0xC8, 0xD0, 0xD8, 0xE0, 0xE8, 0xF0, 0xF8], 0x0B),
-    (0x11, [0xAA, 0xAA, 0xAA, 0x60, 0x68, 0x70, 0x78, 0x80, 0x88, 0x90, 0x98, 0xA0, 0xA8, 0xB0, 0xB8], 0x10),
-    (0x10, [0xAA, 0xAA, 0xAA, 0x00, 0x08, 0x10, 0x18, 0x20, 0x28, 0x30, 0x38, 0x40, 0x48, 0x50, 0x58], 0x10),
-    (0x14, [0x03, 0x1F, 0x3F, 0x5F, 0x7F, 0x9F, 0xBF, 0xDF, 0x03, 0x1F, 0x3F, 0x5F, 0x7F, 0x9F, 0xBF, 0xDF], 0x11),
-    (0x18, [0x70, 0x1A, 0x22, 0xBB, 0xAA, 0xFF, 0x24, 0x71, 0x0F, 0x01, 0x00, 0x03], 0x0D),
-    (0xFE, [0x00], 0x02),
-    (0x3A, [0x55], 0x02),
-    (0xC4, [0x80], 0x02),
-    (0x2A, [0x00, 0x00, 0x00, 0x7D], 0x05),
-    (0x2B, [0x00, 0x00, 0x01, 0x25], 0x05),
-    (0x35, [0x00], 0x02),
-    (0x53, [0x28], 0x02),
-    (0x51, [0xFF], 0x02),
-    (0x11, [0x00], 0x81),
-    (0x29, [0x00], 0x81),
-]
\ No newline at end of file
+# JD9613 init sequence, same table as Clib/JD9613.cpp packed into one blob.
+# Each entry is: cmd, len, params. len is the param count + 1 like in the
+# C table, with 0x80 set when the command needs a 120 ms delay after it.
+import time
+
+INIT_CMDS = (
+    b"\xfe\x02\x01"
+    b"\xf7\x04\x96\x13\xa9"
+    b"\x90\x02\x01"
+    b"\x2c\x0f\x19\x0b\x24\x1b\x1b\x1b\xaa\x50\x01\x16\x04\x04\x04\xd7"
+    b"\x2d\x04\x66\x56\x55"
+    b"\x2e\x0a\x24\x04\x3f\x30\x30\xa8\xb8\xb8\x07"
+    b"\x33\x0d\x03\x03\x03\x19\x19\x19\x13\x13\x13\x1a\x1a\x1a"
+    b"\x10\x0e\x0b\x08\x64\xae\x0b\x08\x64\xae\x00\x80\x00\x00\x01"
+    b"\x11\x06\x01\x1e\x01\x1e\x00"
+    b"\x03\x06\x93\x1c\x00\x01\x7e"
+    b"\x19\x02\x00"
+    b"\x31\x07\x1b\x00\x06\x05\x05\x05"
+    b"\x35\x05\x00\x80\x80\x00"
+    b"\x12\x02\x1b"
+    b"\x1a\x09\x01\x20\x00\x08\x01\x06\x06\x06"
+    b"\x74\x08\xbd\x00\x01\x08\x01\xbb\x98"
+    b"\x6c\x0a\xdc\x08\x02\x01\x08\x01\x30\x08\x00"
+    b"\x6d\x0a\xdc\x08\x02\x01\x08\x02\x30\x08\x00"
+    b"\x76\x0a\xda\x00\x02\x20\x39\x80\x80\x50\x05"
+    b"\x6e\x0a\xdc\x00\x02\x01\x00\x02\x4f\x02\x00"
+    b"\x6f\x0a\xdc\x00\x02\x01\x00\x01\x4f\x02\x00"
+    b"\x80\x08\xbd\x00\x01\x08\x01\xbb\x98"
+    b"\x78\x0a\xdc\x08\x02\x01\x08\x01\x30\x08\x00"
+    b"\x79\x0a\xdc\x08\x02\x01\x08\x02\x30\x08\x00"
+    b"\x82\x0a\xda\x40\x02\x20\x39\x00\x80\x50\x05"
+    b"\x7a\x0a\xdc\x00\x02\x01\x00\x02\x4f\x02\x00"
+    b"\x7b\x0a\xdc\x00\x02\x01\x00\x01\x4f\x02\x00"
+    b"\x84\x0b\x01\x00\x09\x19\x19\x19\x19\x19\x19\x19"
+    b"\x85\x0b\x19\x19\x19\x03\x02\x08\x19\x19\x19\x19"
+    b"\x20\x0d\x20\x00\x08\x00\x02\x00\x40\x00\x10\x00\x04\x00"
+    b"\x1e\x0d\x40\x00\x10\x00\x04\x00\x20\x00\x08\x00\x02\x00"
+    b"\x24\x0d\x20\x00\x08\x00\x02\x00\x40\x00\x10\x00\x04\x00"
+    b"\x22\x0d\x40\x00\x10\x00\x04\x00\x20\x00\x08\x00\x02\x00"
+    b"\x13\x04\x63\x52\x41"
+    b"\x14\x04\x36\x25\x14"
+    b"\x15\x04\x63\x52\x41"
+    b"\x16\x04\x36\x25\x14"
+    b"\x1d\x04\x10\x00\x00"
+    b"\x2a\x03\x0d\x07"
+    b"\x27\x07\x00\x01\x02\x03\x04\x05"
+    b"\x28\x07\x00\x01\x02\x03\x04\x05"
+    b"\x26\x03\x01\x01"
+    b"\x86\x03\x01\x01"
+    b"\xfe\x02\x02"
+    b"\x16\x06\x81\x43\x23\x1e\x03"
+    b"\xfe\x02\x03"
+    b"\x60\x02\x01"
+    b"\x61\x10\x00\x00\x00\x00\x11\x00\x0d\x26\x5a\x80\x80\x95\xf8\x3b\x75"
+    b"\x62\x10\x21\x22\x32\x43\x44\xd7\x0a\x59\xa1\xe1\x52\xb7\x11\x64\xb1"
+    b"\x63\x0c\x54\x55\x66\x06\xfb\x3f\x81\xc6\x06\x45\x83"
+    b"\x64\x10\x00\x00\x11\x11\x21\x00\x23\x6a\xf8\x63\x67\x70\xa5\xdc\x02"
+    b"\x65\x10\x22\x22\x32\x43\x44\x24\x44\x82\xc1\xf8\x61\xbf\x13\x62\xad"
+    b"\x66\x0c\x54\x55\x65\x06\xf5\x37\x76\xb8\xf5\x31\x6c"
+    b"\x67\x10\x00\x10\x22\x22\x22\x00\x37\xa4\x7e\x22\x25\x2c\x4c\x72\x9a"
+    b"\x68\x10\x22\x33\x43\x44\x55\xc1\xe5\x2d\x6f\xaf\x23\x8f\xf3\x50\xa6"
+    b"\x69\x0c\x65\x66\x77\x07\xfd\x4e\x9c\xed\x39\x86\xd3"
+    b"\xfe\x02\x05"
+    b"\x61\x10\x00\x31\x44\x54\x55\x00\x92\xb5\x88\x19\x90\xe8\x3e\x71\xa5"
+    b"\x62\x10\x55\x66\x76\x77\x88\xce\xf2\x32\x6e\xc4\x34\x8b\xd9\x2a\x7d"
+    b"\x63\x0c\x98\x99\xaa\x0a\xdc\x2e\x7d\xc3\x0d\x5b\x9e"
+    b"\x64\x10\x00\x31\x44\x54\x55\x00\xa2\xe5\xcd\x5c\x94\xcf\x09\x4a\x72"
+    b"\x65\x10\x55\x65\x66\x77\x87\x9c\xc2\xff\x36\x6a\xec\x45\x91\xd8\x20"
+    b"\x66\x0c\x88\x98\x99\x0a\x68\xb0\xfb\x43\x8c\xd5\x0e"
+    b"\x67\x10\x00\x42\x55\x55\x55\x00\xcb\x62\xc5\x09\x44\x72\xa9\xd6\xfd"
+    b"\x68\x10\x66\x66\x77\x87\x98\x21\x45\x96\xed\x29\x90\xee\x4b\xb1\x13"
+    b"\x69\x0c\x99\xaa\xba\x0b\x6a\xb8\x0d\x62\xb8\x0e\x54"
+    b"\xfe\x02\x07"
+    b"\x3e\x02\x00"
+    b"\x42\x03\x03\x10"
+    b"\x4a\x02\x31"
+    b"\x5c\x02\x01"
+    b"\x3c\x07\x07\x00\x24\x04\x3f\xe2"
+    b"\x44\x05\x03\x40\x3f\x02"
+    b"\x12\x0b\xaa\xaa\xc0\xc8\xd0\xd8\xe0\xe8\xf0\xf8"
+    b"\x11\x10\xaa\xaa\xaa\x60\x68\x70\x78\x80\x88\x90\x98\xa0\xa8\xb0\xb8"
+    b"\x10\x10\xaa\xaa\xaa\x00\x08\x10\x18\x20\x28\x30\x38\x40\x48\x50\x58"
+    b"\x14\x11\x03\x1f\x3f\x5f\x7f\x9f\xbf\xdf\x03\x1f\x3f\x5f\x7f\x9f\xbf\xdf"
+    b"\x18\x0d\x70\x1a\x22\xbb\xaa\xff\x24\x71\x0f\x01\x00\x03"
+    b"\xfe\x02\x00"
+    b"\x3a\x02\x55"
+    b"\xc4\x02\x80"
+    b"\x2a\x05\x00\x00\x00\x7d"
+    b"\x2b\x05\x00\x00\x01\x25"
+    b"\x35\x02\x00"
+    b"\x53\x02\x28"
+    b"\x51\x02\xff"
+    b"\x11\x81"
+    b"\x29\x81"
+)
+
+
+def init(spi, cs, dc):
+    """Send INIT_CMDS, one CS framed transaction per command"""
+    mv = memoryview(INIT_CMDS)
+    i = 0
+    end = len(INIT_CMDS)
+    while i < end:
+        flags = INIT_CMDS[i + 1]
+        n = (flags & 0x7F) - 1
+        cs.value(0)
+        dc.value(0)
+        spi.write(mv[i:i + 1])
+        if n:
+            dc.value(1)
+            spi.write(mv[i + 2:i + 2 + n])
+        cs.value(1)
+        if flags & 0x80:
+            time.sleep_ms(120)
+        i += 2 + n
@@ -0,0 +1,72 @@
+# adisplay.py
+# asyncio front end for the JD9613 driver in screentest_m. Long transfers
+# are cut into bursts of about chunk bytes with a yield after each, so the
+# trackball, battery monitor and other tasks keep running during a full
+# screen redraw. Every burst is a complete window write, nothing is left
+# half sent while another task runs.
+#
+#   disp = AsyncDisplay()
+#   await disp.fill(0x0000)
+#   draw(bb)
+#   await disp.show(bb)
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+import screentest_m as tft
+
+CHUNK_BYTES = 4096
+
+class AsyncDisplay:
+    def __init__(self, chunk=CHUNK_BYTES):
+        self.chunk = chunk
+        # Held for a whole operation so tasks don't interleave on the bus
+        self.lock = asyncio.Lock()
+
+    def _rows(self, w):
+        return max(1, self.chunk // (w * 2))
+
+    async def fill(self, color):
+        w, h = tft.screen_size()
+        await self.fill_rect(0, 0, w, h, color)
+
+    async def fill_rect(self, x, y, w, h, color):
+        if w <= 0 or h <= 0:
+            return
+        rows = self._rows(w)
+        async with self.lock:
+            for band_y in range(y, y + h, rows):
+                tft.fill_rect(x, band_y, w, min(rows, y + h - band_y), color)
+                await asyncio.sleep(0)
+
+    async def blit_buffer(self, buf, x, y, w, h):
+        """Send a w x h panel ordered RGB565 buffer"""
+        if w <= 0 or h <= 0:
+            return
+        mv = memoryview(buf)
+        rows = self._rows(w)
+        row_bytes = w * 2
+        async with self.lock:
+            for r in range(0, h, rows):
+                n = min(rows, h - r)
+                tft.blit_buffer(mv[r * row_bytes:(r + n) * row_bytes], x, y + r, w, n)
+                await asyncio.sleep(0)
+
+    async def text(self, x, y, text, color, scale=1, bg=0):
+        async with self.lock:
+            tft.draw_scaled_text(x, y, text, color, scale, bg)
+        await asyncio.sleep(0)
+
+    async def show(self, bb):
+        """Push the dirty regions of a BackBuffer or PaletteBuffer. Drawing
+        into bb while this runs is fine, it lands in the next show()"""
+        dirty = bb.take_dirty()
+        async with self.lock:
+            for x0, y0, x1, y1 in dirty:
+                w = x1 - x0 + 1
+                rows = self._rows(w)
+                for band_y in range(y0, y1 + 1, rows):
+                    bb.push_region(x0, band_y, w, min(rows, y1 + 1 - band_y))
+                    await asyncio.sleep(0)
+            if bb.sprites:
+                bb.refresh_sprites(dirty)
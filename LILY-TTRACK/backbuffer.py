@@ -0,0 +1,260 @@
+# backbuffer.py
+# Optional full frame back buffers for the JD9613 panel, RGB565 or indexed
+# color. Draw into them freely, then call show() once per frame to push
+# only the regions that changed.
+import framebuf
+import screentest_m as tft
+
+try:
+    from fastpix import lut_row4, lut_row8
+except (ImportError, SyntaxError):
+    def lut_row4(src, start, n, lut, dst):
+        j = 0
+        for i in range(start, start + n):
+            b = src[i >> 1]
+            c = (b & 0x0F if i & 1 else b >> 4) * 2
+            dst[j] = lut[c]
+            dst[j + 1] = lut[c + 1]
+            j += 2
+
+    def lut_row8(src, start, n, lut, dst):
+        j = 0
+        for i in range(start, start + n):
+            c = src[i] * 2
+            dst[j] = lut[c]
+            dst[j + 1] = lut[c + 1]
+            j += 2
+
+class BackBuffer:
+    def __init__(self, width=tft.DISPLAY_WIDTH, height=tft.DISPLAY_HEIGHT, max_dirty=8):
+        """width/height are in the current rotation, 126x294 needs ~74 KB"""
+        self.width = width
+        self.height = height
+        self._alloc()
+        self._mv = memoryview(self.buf)
+        self._max_dirty = max_dirty
+        # Dirty rectangles as [x0, y0, x1, y1], inclusive
+        self._dirty = []
+        # Sprites drawn over this buffer, see sprite.py
+        self.sprites = []
+
+    def _alloc(self):
+        """Create self.buf and self.fb for self.width x self.height"""
+        self.buf = bytearray(self.width * self.height * 2)
+        self.fb = framebuf.FrameBuffer(self.buf, self.width, self.height, framebuf.RGB565)
+
+    def mark_dirty(self, x, y, w, h):
+        """Add a rectangle to the dirty list, merging it with any it touches"""
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + w, self.width) - 1
+        y1 = min(y + h, self.height) - 1
+        if x1 < x0 or y1 < y0:
+            return
+        dirty = self._dirty
+        i = 0
+        while i < len(dirty):
+            r = dirty[i]
+            if x0 <= r[2] + 1 and r[0] <= x1 + 1 and y0 <= r[3] + 1 and r[1] <= y1 + 1:
+                # Overlapping or adjacent, grow and recheck the others
+                x0 = min(x0, r[0])
+                y0 = min(y0, r[1])
+                x1 = max(x1, r[2])
+                y1 = max(y1, r[3])
+                dirty.pop(i)
+                i = 0
+            else:
+                i += 1
+        dirty.append([x0, y0, x1, y1])
+        if len(dirty) > self._max_dirty:
+            # Too fragmented, flush the bounding box instead
+            self._dirty = [[min(r[0] for r in dirty), min(r[1] for r in dirty),
+                            max(r[2] for r in dirty), max(r[3] for r in dirty)]]
+
+    def _color(self, color):
+        """Map an RGB565 color to what is stored in self.buf"""
+        return tft.swap565(color)
+
+    def take_dirty(self):
+        """Return the dirty rectangles as [x0, y0, x1, y1] (inclusive) and
+        start a new list. The caller is then responsible for pushing them,
+        see push_region() and refresh_sprites()."""
+        dirty = self._dirty
+        self._dirty = []
+        return dirty
+
+    def mark_all(self):
+        self._dirty = [[0, 0, self.width - 1, self.height - 1]]
+
+    def fill(self, color):
+        self.fb.fill(self._color(color))
+        self.mark_all()
+
+    def fill_rect(self, x, y, w, h, color):
+        self.fb.fill_rect(x, y, w, h, self._color(color))
+        self.mark_dirty(x, y, w, h)
+
+    def pixel(self, x, y, color):
+        self.fb.pixel(x, y, self._color(color))
+        self.mark_dirty(x, y, 1, 1)
+
+    def hline(self, x, y, w, color):
+        self.fb.hline(x, y, w, self._color(color))
+        self.mark_dirty(x, y, w, 1)
+
+    def vline(self, x, y, h, color):
+        self.fb.vline(x, y, h, self._color(color))
+        self.mark_dirty(x, y, 1, h)
+
+    def rect(self, x, y, w, h, color):
+        self.fb.rect(x, y, w, h, self._color(color))
+        self.mark_dirty(x, y, w, h)
+
+    def text(self, text, x, y, color):
+        self.fb.text(text, x, y, self._color(color))
+        self.mark_dirty(x, y, len(text) * tft.FONT_WIDTH, tft.FONT_HEIGHT)
+
+    def blit(self, fb, x, y, w, h, key=-1):
+        """Blit a panel ordered RGB565 FrameBuffer of size w x h"""
+        self.fb.blit(fb, x, y, key)
+        self.mark_dirty(x, y, w, h)
+
+    def show(self, worker=None):
+        """Push all dirty regions to the panel and clear the dirty list. With
+        a started FlushWorker the regions are copied into its slots and sent
+        from the worker thread, so drawing can go on once show() returns."""
+        row_bytes = self.width * 2
+        dirty = self.take_dirty()
+        for x0, y0, x1, y1 in dirty:
+            w = x1 - x0 + 1
+            h = y1 - y0 + 1
+            if worker is not None:
+                start = (y0 * self.width + x0) * 2
+                worker.push(self._mv[start:], row_bytes, x0, y0, w, h)
+            else:
+                self.push_region(x0, y0, w, h)
+        if worker is not None and self._sprites_hit(dirty):
+            # Sprites write to the bus themselves
+            worker.sync()
+        self.refresh_sprites(dirty)
+
+    def push_region(self, x0, y0, w, h):
+        """Send the part of the w x h block at x0, y0 inside the clip"""
+        row_bytes = self.width * 2
+        if w == self.width:
+            # Full rows are contiguous, one write, blit_buffer clips
+            start = y0 * row_bytes
+            tft.blit_buffer(self._mv[start:start + h * row_bytes], x0, y0, w, h)
+            return
+        clip = tft.clip_rect(x0, y0, w, h)
+        if clip is None:
+            return
+        x0, y0, x1, y1 = clip
+        w = x1 - x0
+        h = y1 - y0
+        start = (y0 * self.width + x0) * 2
+        tft.set_window(x0, y0, w, h)
+        tft.tft_dc.value(1)
+        tft.tft_cs.value(0)
+        for _ in range(h):
+            tft.spi.write(self._mv[start:start + w * 2])
+            start += row_bytes
+        tft.tft_cs.value(1)
+
+    def _sprites_hit(self, dirty):
+        for s in self.sprites:
+            if s.visible:
+                for r in dirty:
+                    if s.overlaps(r[0], r[1], r[2], r[3]):
+                        return True
+        return False
+
+    def refresh_sprites(self, dirty):
+        """Repaint visible sprites over any of the pushed regions"""
+        for s in self.sprites:
+            if s.visible:
+                for r in dirty:
+                    if s.overlaps(r[0], r[1], r[2], r[3]):
+                        s.refresh()
+                        break
+
+
+class PaletteBuffer(BackBuffer):
+    """Indexed color back buffer, colors passed to the drawing methods are
+    palette indices. bpp=4 (GS4_HMSB, ~18 KB) or bpp=8 (GS8, ~37 KB).
+    Rows are expanded through the RGB565 palette on show()."""
+    def __init__(self, bpp=4, width=tft.DISPLAY_WIDTH, height=tft.DISPLAY_HEIGHT, max_dirty=8):
+        self.bpp = bpp
+        super().__init__(width, height, max_dirty)
+        # Palette entries in panel byte order
+        self.lut = bytearray(2 << bpp)
+        self._line = bytearray(width * 2)
+
+    def _alloc(self):
+        w = self.width
+        h = self.height
+        if self.bpp == 4:
+            self.buf = bytearray((w * h + 1) // 2)
+            self.fb = framebuf.FrameBuffer(self.buf, w, h, framebuf.GS4_HMSB)
+            self._expand = lut_row4
+        else:
+            self.buf = bytearray(w * h)
+            self.fb = framebuf.FrameBuffer(self.buf, w, h, framebuf.GS8)
+            self._expand = lut_row8
+
+    def _color(self, color):
+        return color
+
+    def set_palette(self, index, color):
+        """Change one entry. Nothing is redrawn, the next show() re-expands"""
+        self.lut[index * 2] = color >> 8
+        self.lut[index * 2 + 1] = color & 0xFF
+        self.mark_all()
+
+    def set_palette_list(self, colors):
+        for i, color in enumerate(colors):
+            self.lut[i * 2] = color >> 8
+            self.lut[i * 2 + 1] = color & 0xFF
+        self.mark_all()
+
+    def show(self, worker=None):
+        """Expand and push the dirty regions. With a started FlushWorker the
+        rows are expanded straight into its slots."""
+        dirty = self.take_dirty()
+        for x0, y0, x1, y1 in dirty:
+            w = x1 - x0 + 1
+            h = y1 - y0 + 1
+            if worker is None:
+                self.push_region(x0, y0, w, h)
+                continue
+            row_bytes = w * 2
+            rows = worker.rows_per_slot(row_bytes)
+            start = y0 * self.width + x0
+            while h > 0:
+                n = min(rows, h)
+                i = worker.acquire()
+                dst = memoryview(worker.bufs[i])
+                for r in range(n):
+                    self._expand(self.buf, start, w, self.lut, dst[r * row_bytes:])
+                    start += self.width
+                worker.submit(i, x0, y0, w, n)
+                y0 += n
+                h -= n
+
+    def push_region(self, x0, y0, w, h):
+        clip = tft.clip_rect(x0, y0, w, h)
+        if clip is None:
+            return
+        x0, y0, x1, y1 = clip
+        w = x1 - x0
+        h = y1 - y0
+        row = memoryview(self._line)[:w * 2]
+        start = y0 * self.width + x0
+        tft.set_window(x0, y0, w, h)
+        tft.tft_dc.value(1)
+        tft.tft_cs.value(0)
+        for _ in range(h):
+            self._expand(self.buf, start, w, self.lut, self._line)
+            tft.spi.write(row)
+            start += self.width
+        tft.tft_cs.value(1)
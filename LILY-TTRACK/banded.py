@@ -0,0 +1,96 @@
+# banded.py
+# Banded scanline renderer for the JD9613 panel. The app records a display
+# list, render() rasterizes it into a small band buffer of band_rows rows
+# and streams every finished band, so a full screen never needs a full
+# frame buffer in RAM.
+import framebuf
+import screentest_m as tft
+
+# Display list op kinds
+OP_FILL = 0
+OP_TEXT = 1
+OP_HLINE = 2
+OP_VLINE = 3
+OP_BLIT = 4
+
+class BandRenderer:
+    def __init__(self, band_rows=16, width=tft.DISPLAY_WIDTH, height=tft.DISPLAY_HEIGHT):
+        """RAM use is width * band_rows * 2 bytes, SPI bursts height / band_rows"""
+        self.width = width
+        self.height = height
+        self.band_rows = band_rows
+        self.buf = bytearray(width * band_rows * 2)
+        self._mv = memoryview(self.buf)
+        self.fb = framebuf.FrameBuffer(self.buf, width, band_rows, framebuf.RGB565)
+        # Ops as (kind, x, y, w, h, color, arg)
+        self._ops = []
+        self._worker = None
+        self._worker_fbs = None
+
+    def clear(self):
+        self._ops = []
+
+    def fill_rect(self, x, y, w, h, color):
+        self._ops.append((OP_FILL, x, y, w, h, tft.swap565(color), None))
+
+    def text(self, text, x, y, color):
+        self._ops.append((OP_TEXT, x, y, len(text) * tft.FONT_WIDTH, tft.FONT_HEIGHT, tft.swap565(color), text))
+
+    def hline(self, x, y, w, color):
+        self._ops.append((OP_HLINE, x, y, w, 1, tft.swap565(color), None))
+
+    def vline(self, x, y, h, color):
+        self._ops.append((OP_VLINE, x, y, 1, h, tft.swap565(color), None))
+
+    def blit(self, fb, x, y, w, h, key=-1):
+        """Blit a panel ordered RGB565 FrameBuffer of size w x h"""
+        self._ops.append((OP_BLIT, x, y, w, h, key, fb))
+
+    def render(self, bg=0x0000, y0=0, y1=None, worker=None):
+        """Rasterize the display list band by band over rows y0..y1. With a
+        started FlushWorker the bands alternate between its slots and are
+        streamed by the worker while the next one is drawn."""
+        if y1 is None:
+            y1 = self.height
+        bg = tft.swap565(bg)
+        rows = self.band_rows
+        if worker is not None:
+            fbs = self._slot_fbs(worker)
+        band_y = y0
+        while band_y < y1:
+            h = min(rows, y1 - band_y)
+            if worker is None:
+                self._raster(self.fb, band_y, h, bg)
+                tft.blit_buffer(self._mv[:self.width * h * 2], 0, band_y, self.width, h)
+            else:
+                i = worker.acquire()
+                self._raster(fbs[i], band_y, h, bg)
+                worker.submit(i, 0, band_y, self.width, h)
+            band_y += h
+
+    def _slot_fbs(self, worker):
+        """FrameBuffers over the worker's slots, made once per worker"""
+        if self._worker is not worker:
+            if worker.size < len(self.buf):
+                raise ValueError("worker slots smaller than a band")
+            self._worker = worker
+            self._worker_fbs = [framebuf.FrameBuffer(b, self.width, self.band_rows, framebuf.RGB565)
+                                for b in worker.bufs]
+        return self._worker_fbs
+
+    def _raster(self, fb, band_y, h, bg):
+        fb.fill(bg)
+        for kind, x, y, w, oh, color, arg in self._ops:
+            if y >= band_y + h or y + oh <= band_y:
+                continue
+            y -= band_y
+            if kind == OP_FILL:
+                fb.fill_rect(x, y, w, oh, color)
+            elif kind == OP_TEXT:
+                fb.text(arg, x, y, color)
+            elif kind == OP_HLINE:
+                fb.hline(x, y, w, color)
+            elif kind == OP_VLINE:
+                fb.vline(x, y, oh, color)
+            else:
+                fb.blit(arg, x, y, color)
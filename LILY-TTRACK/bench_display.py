@@ -0,0 +1,269 @@
+# Display throughput benchmarks for the JD9613 driver in screentest_m.
+# Run with: mpremote run bench_display.py
+from machine import Pin
+import time
+import screentest_m as tft
+
+def fill_rect_per_pixel(x, y, w, h, color):
+    """Old fill path, one 2 byte write per pixel. Kept as a reference."""
+    tft.set_window(x, y, w, h)
+    tft.tft_dc.value(1)
+    tft.tft_cs.value(0)
+    for _ in range(w * h):
+        tft.spi.write(bytes([color >> 8, color & 0xFF]))
+    tft.tft_cs.value(1)
+
+def measure(name, fn, pixels, repeat=3):
+    best = None
+    for i in range(repeat):
+        start = time.ticks_us()
+        fn(i)
+        took = time.ticks_diff(time.ticks_us(), start)
+        if best is None or took < best:
+            best = took
+    rate = pixels * 1000000 // best
+    print(f"{name}: {best / 1000:.1f} ms, {rate} px/s")
+    return rate
+
+def bench_fill():
+    w = tft.DISPLAY_WIDTH
+    h = tft.DISPLAY_HEIGHT
+    colors = (0xF800, 0x07E0, 0x001F)
+    before = measure("fill per pixel", lambda i: fill_rect_per_pixel(0, 0, w, h, colors[i]), w * h, 1)
+    after = measure("fill streamed", lambda i: tft.fill_rect(0, 0, w, h, colors[i]), w * h)
+    print(f"fill speedup: {after / before:.1f}x")
+
+def bench_cursor(moves=500):
+    """Small sprite redraws, dominated by address window setup"""
+    size = tft.CURSOR_SIZE
+    n = size * size * moves
+    measure("5x5 same spot", lambda i: [tft.fill_rect(60, 140, size, size, 0xFFFF) for _ in range(moves)], n)
+    measure("5x5 moving", lambda i: [tft.fill_rect(j % 120, j % 288, size, size, 0xFFFF) for j in range(moves)], n)
+
+def draw_ui(d):
+    """A typical status screen, d is screentest_m or a BackBuffer"""
+    d.fill_rect(0, 0, 126, 20, 0x001F)
+    d.fill_rect(4, 30, 118, 60, 0x01E0)
+    for row in range(8):
+        d.fill_rect(4, 100 + row * 12, 118, 10, 0x4208)
+    d.fill_rect(60, 140, 5, 5, 0xFFFF)
+
+def bench_backbuffer():
+    import backbuffer
+    bb = backbuffer.BackBuffer()
+    n = 126 * 20 + 118 * 60 + 8 * 118 * 10
+    measure("ui direct", lambda i: draw_ui(tft), n)
+    measure("ui backbuffer", lambda i: (draw_ui(bb), bb.show()), n)
+
+def bench_banded():
+    """Full screen redraw through the band renderer at several band heights"""
+    import banded
+    import gc
+    n = 126 * 294
+    for rows in (8, 16, 32, 64):
+        gc.collect()
+        br = banded.BandRenderer(band_rows=rows)
+        draw_ui(br)
+        br.text("LilyGo T-Track", 8, 6, 0xFFFF)
+        bursts = (294 + rows - 1) // rows
+        print(f"band {rows} rows: {len(br.buf)} bytes, {bursts} bursts")
+        measure(f"  render {rows}", lambda i: br.render(), n)
+
+def bench_scaled_text():
+    text = "Battery 3.92V 87"
+    for scale in (2, 3):
+        n = len(text) * 8 * 8 * scale * scale
+        measure(f"scaled text x{scale}", lambda i: tft.draw_scaled_text(0, 100, text, 0xFFFF, scale), n)
+
+def bench_label_cache():
+    import gc
+    labels = ("LilyGo T-Track", "Battery", "Settings", "About")
+    n = sum(len(t) for t in labels) * 64 * 20
+    def draw(i):
+        for _ in range(20):
+            for row, text in enumerate(labels):
+                tft.draw_text(4, 10 + row * 12, text, 0xFFFF)
+    cache = tft.label_cache
+    budget = cache.budget
+    cache.budget = 0
+    gc.collect()
+    free = gc.mem_free()
+    measure("labels uncached", draw, n, 1)
+    print(f"  heap churn: {free - gc.mem_free()} bytes")
+    cache.budget = budget
+    cache.clear()
+    draw(0)
+    gc.collect()
+    free = gc.mem_free()
+    measure("labels cached", draw, n, 1)
+    print(f"  heap churn: {free - gc.mem_free()} bytes, hits {cache.hits} misses {cache.misses}")
+
+def bench_sprite(moves=500):
+    import backbuffer
+    import sprite
+    bb = backbuffer.BackBuffer()
+    draw_ui(bb)
+    bb.show()
+    cur = sprite.Sprite(bb, tft.CURSOR_SIZE, tft.CURSOR_SIZE, tft.CURSOR_COLOR)
+    cur.move(60, 140)
+    def run(i):
+        for j in range(moves):
+            cur.move(60 + (j & 7), 140 + (j & 3))
+    measure("sprite moves", run, tft.CURSOR_SIZE * tft.CURSOR_SIZE * moves)
+
+def bench_console(lines=200):
+    import console
+    con = console.Console(top=16)
+    start = time.ticks_us()
+    for i in range(lines):
+        con.log(f"diag {i} ok")
+    took = time.ticks_diff(time.ticks_us(), start)
+    print(f"console: {lines * 1000000 // took} lines/s")
+    con.clear()
+
+def bench_palette():
+    import backbuffer
+    import gc
+    n = 126 * 294
+    for bpp in (4, 8):
+        gc.collect()
+        pb = backbuffer.PaletteBuffer(bpp)
+        pb.set_palette_list((0x0000, 0x001F, 0x01E0, 0x4208, 0xFFFF))
+        print(f"palette {bpp} bpp: {len(pb.buf)} bytes")
+        measure(f"  palette swap flush {bpp}", lambda i: (pb.set_palette(1, 0x001F + i), pb.show()), n)
+        # Release it before the next buffer is allocated
+        pb = None
+
+def bench_shapes():
+    import shapes
+    def gauge(i):
+        shapes.fill_circle(63, 147, 50, 0x001F)
+        shapes.circle(63, 147, 55, 0xFFFF)
+        shapes.line(63, 147, 63 + 40, 147 - 20 - i, 0xF800)
+        shapes.fill_round_rect(8, 20, 110, 30, 8, 0x4208)
+        shapes.fill_polygon(((10, 230), (116, 240), (60, 285)), 0x07E0)
+    start = time.ticks_us()
+    for i in range(10):
+        gauge(i)
+    print(f"shapes gauge: {time.ticks_diff(time.ticks_us(), start) // 10} us/frame")
+
+def bench_pacing(frames=120, te_pin=None):
+    import backbuffer
+    import framepacer
+    bb = backbuffer.BackBuffer()
+    draw_ui(bb)
+    pacer = framepacer.FramePacer(te_pin=te_pin, fps=60)
+    for i in range(frames):
+        bb.fill_rect(4, 30, 118, 60, 0x01E0)
+        bb.fill_rect(4 + i % 100, 40, 18, 40, 0xFFFF)
+        pacer.present(bb.show)
+    pacer.deinit()
+    print(f"paced frames: {pacer.stats()}")
+
+def bench_rotated():
+    buf, w, h = tft.render_label("Landscape", 0xFFFF, 0x001F, 2)
+    measure("rotated blit", lambda i: tft.blit_rotated(buf, 20, 40, w, h), w * h)
+    measure("portrait blit", lambda i: tft.blit_buffer(buf, 0, 40, w, h), w * h)
+
+def bench_threaded(frames=60):
+    """Worst gap between input polls while redrawing every frame, i.e. how
+    long a trackball edge can wait, with and without the flush worker"""
+    import banded
+    import backbuffer
+    import flushworker
+    worker = flushworker.FlushWorker()
+    br = banded.BandRenderer(band_rows=16)
+    draw_ui(br)
+    bb = backbuffer.BackBuffer()
+    draw_ui(bb)
+    def run(name, frame):
+        last = time.ticks_us()
+        worst = 0
+        start = last
+        for i in range(frames):
+            frame(i)
+            # Input poll point
+            now = time.ticks_us()
+            worst = max(worst, time.ticks_diff(now, last))
+            last = now
+        worker.sync()
+        took = time.ticks_diff(time.ticks_us(), start)
+        print(f"{name}: {took // frames} us/frame, input gap max {worst} us")
+    def bb_frame(i):
+        bb.fill_rect(4, 30, 118, 60, 0x01E0)
+        bb.fill_rect(4 + i % 100, 40, 18, 40, 0xFFFF)
+    run("banded single", lambda i: br.render())
+    run("backbuffer single", lambda i: (bb_frame(i), bb.show()))
+    worker.start()
+    run("banded threaded", lambda i: br.render(worker=worker))
+    run("backbuffer threaded", lambda i: (bb_frame(i), bb.show(worker)))
+    worker.stop()
+    print(f"  worker: {worker.flushes} flushes, {worker.busy_us // 1000} ms on the bus")
+
+def bench_async(frames=10):
+    """Worst stall seen by another asyncio task during full screen redraws,
+    blocking calls against AsyncDisplay"""
+    import asyncio
+    import adisplay
+    import backbuffer
+    disp = adisplay.AsyncDisplay()
+    bb = backbuffer.BackBuffer()
+    draw_ui(bb)
+    async def ticker(state):
+        last = time.ticks_us()
+        while state[0]:
+            await asyncio.sleep(0)
+            now = time.ticks_us()
+            state[1] = max(state[1], time.ticks_diff(now, last))
+            last = now
+    async def run(name, redraw):
+        state = [True, 0]
+        task = asyncio.create_task(ticker(state))
+        await asyncio.sleep(0)
+        start = time.ticks_us()
+        for i in range(frames):
+            await redraw(i)
+        took = time.ticks_diff(time.ticks_us(), start)
+        state[0] = False
+        await task
+        print(f"{name}: {took // frames} us/frame, other task stalled up to {state[1]} us")
+    async def blocking(i):
+        tft.fill_rect(0, 0, 126, 294, 0x001F * (i & 1))
+        bb.mark_all()
+        bb.show()
+        await asyncio.sleep(0)
+    async def chunked(i):
+        await disp.fill(0x001F * (i & 1))
+        bb.mark_all()
+        await disp.show(bb)
+    asyncio.run(run("redraw blocking", blocking))
+    asyncio.run(run("redraw async", chunked))
+
+def bench_init():
+    """Time from reset to the first pixel on the panel"""
+    start = time.ticks_ms()
+    tft.init_display()
+    tft.fill_rect(0, 0, 1, 1, 0xFFFF)
+    print(f"boot to first pixel: {time.ticks_diff(time.ticks_ms(), start)} ms")
+
+def main():
+    Pin(4, Pin.OUT).on()
+    bench_init()
+    tft.set_rotation(tft.ROTATION_0)
+    tft.sleep_out()
+    bench_fill()
+    bench_cursor()
+    bench_backbuffer()
+    bench_banded()
+    bench_scaled_text()
+    bench_label_cache()
+    bench_sprite()
+    bench_console()
+    bench_palette()
+    bench_shapes()
+    bench_pacing()
+    bench_rotated()
+    bench_threaded()
+    bench_async()
+
+main()
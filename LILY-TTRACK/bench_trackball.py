@@ -0,0 +1,51 @@
+# Trackball input latency benchmarks. The ball is simulated through the
+# injectable GPIO register source, so no hands are needed.
+# Run with: mpremote run bench_trackball.py
+import time
+import trackball
+
+def measure_latency(name, edge_us, draw_us, duration_ms=2000, **init_args):
+    """Toggle gs2 every edge_us / 2 and report how long the first edge of
+    each move waits until the move callback sees it. The callback busy
+    waits draw_us to stand in for a cursor redraw."""
+    state = [0, None]  # register bits, time of the oldest unreported edge
+    tb = trackball.Trackball(read_gpio=lambda: state[0])
+    tb.init(fast_sample=True, **init_args)
+    lat = []
+    counts = [0]
+    def on_move(delta):
+        lat.append(time.ticks_diff(time.ticks_us(), state[1]))
+        state[1] = None
+        counts[0] += delta[0]
+        time.sleep_us(draw_us)
+    tb.on_move(on_move)
+    start = time.ticks_ms()
+    next_edge = time.ticks_us()
+    while time.ticks_diff(time.ticks_ms(), start) < duration_ms:
+        now = time.ticks_us()
+        if time.ticks_diff(now, next_edge) >= 0:
+            state[0] ^= trackball.GS2_BIT
+            if state[0] and state[1] is None:
+                state[1] = now
+            next_edge = time.ticks_add(next_edge, edge_us // 2)
+        tb.update()
+        time.sleep_ms(1)
+    if not lat:
+        print(f"{name}: no moves")
+        return
+    print(f"{name}: {len(lat)} callbacks, {counts[0]} counts, "
+          f"latency avg {sum(lat) // len(lat) // 1000} ms max {max(lat) // 1000} ms")
+
+def bench_aggregation():
+    for edge_us, label in ((50000, "slow"), (4000, "fast")):
+        measure_latency(f"fixed 100 ms, {label} ball", edge_us, 3000,
+                        poll_interval_ms=10, aggregation_interval_ms=100)
+        measure_latency(f"adaptive, {label} ball", edge_us, 3000,
+                        poll_interval_ms=10, adaptive=True)
+        measure_latency(f"adaptive 1 ms poll, {label} ball", edge_us, 3000,
+                        poll_interval_ms=1, adaptive=True)
+
+def main():
+    bench_aggregation()
+
+main()
@@ -11,4 +11,5 @@ from machine import Pin
 pinPWR = Pin(4, Pin.OUT)
 pinPWR.on()
 
-import screentest_m
\ No newline at end of file
+import screentest_m
+screentest_m.main()
\ No newline at end of file
@@ -0,0 +1,103 @@
+# Host side check of the report coalescing in hidmouse.py against a fake
+# HID device that now and then refuses a report as busy.
+# Run on a PC, not the board: python3 check_hidmouse.py
+import random
+import sys
+
+import check_trackball  # installs the machine/micropython/time stand-ins
+import trackball
+import hidmouse
+
+GAIN = 24  # 1.5x in 1/16 steps
+
+class FakeHID:
+    """Records accepted reports, refuses the next `busy` calls"""
+    def __init__(self):
+        self.moves = []
+        self.clicks = []
+        self.busy = 0
+        self.calls = 0
+
+    def _refuse(self):
+        self.calls += 1
+        if self.busy:
+            self.busy -= 1
+            return True
+        return False
+
+    def send_report(self, dx, dy):
+        if self._refuse():
+            return False
+        self.moves.append((dx, dy))
+        return True
+
+    def click_left(self, down=True):
+        if self._refuse():
+            return False
+        self.clicks.append(down)
+        return True
+
+def check(reports=3000, seed=4):
+    random.seed(seed)
+    bits = [trackball.KEY_BIT]
+    tb = trackball.Trackball(read_gpio=lambda: bits[0])
+    tb.init(poll_interval_ms=0, fast_sample=True)
+    hid = FakeHID()
+    mouse = hidmouse.TrackballMouse(tb, hid, sensitivity=GAIN)
+    edges = {trackball.GS1_BIT: (0, 1), trackball.GS2_BIT: (1, 0),
+             trackball.GS3_BIT: (0, -1), trackball.GS4_BIT: (-1, 0)}
+    count_x = 0
+    count_y = 0
+    ok = True
+    for n in range(reports + 300):
+        if n < reports:
+            # Some quiet reports, some spins far past one report's +/-127,
+            # each mostly in one direction like a real flick of the ball
+            spin = random.choice(tuple(edges))
+            for _ in range(random.choice((0, 3, 40, 250))):
+                bit = spin if random.random() < 0.8 else random.choice(tuple(edges))
+                bits[0] |= bit
+                tb.update()
+                bits[0] &= ~bit
+                tb.update()
+                count_x += edges[bit][0]
+                count_y += edges[bit][1]
+            if random.random() < 0.02:
+                bits[0] ^= trackball.KEY_BIT
+                tb.update()
+            if random.random() < 0.1:
+                hid.busy = random.randint(1, 3)
+        calls = hid.calls
+        mouse.report()
+        if hid.calls - calls > 1:
+            print(f"report {n}: {hid.calls - calls} HID calls")
+            ok = False
+    for dx, dy in hid.moves:
+        if not (-127 <= dx <= 127 and -127 <= dy <= 127) or (dx, dy) == (0, 0):
+            print(f"bad report {dx}, {dy}")
+            ok = False
+    # Nothing lost or duplicated through clamping, carrying and retries
+    sent_x = sum(m[0] for m in hid.moves)
+    sent_y = sum(m[1] for m in hid.moves)
+    want_x = count_x * GAIN >> 4
+    want_y = count_y * GAIN >> 4
+    if (sent_x, sent_y) != (want_x, want_y):
+        print(f"moved {sent_x}, {sent_y}, expected {want_x}, {want_y}")
+        ok = False
+    # Every accepted click changes the button, the last one matches the pin
+    pressed = not (bits[0] & trackball.KEY_BIT)
+    for a, b in zip(hid.clicks, hid.clicks[1:]):
+        if a == b:
+            print("repeated click report")
+            ok = False
+            break
+    if not hid.clicks or hid.clicks[-1] != pressed:
+        print(f"button ended at {hid.clicks[-1:]}, pin says {pressed}")
+        ok = False
+    if ok:
+        print(f"hidmouse ok: {len(hid.moves)} move and {len(hid.clicks)} button reports, "
+              f"{sent_x}, {sent_y} moved")
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if check() else 1)
@@ -0,0 +1,83 @@
+# Host side check that the GPIO_IN fast sampler in trackball.py reports the
+# same moves and button changes as the Pin.value() dict path.
+# Run on a PC, not the board: python3 check_trackball.py
+import random
+import sys
+import time
+import types
+
+# Just enough of machine/micropython/time to import trackball on CPython
+machine = types.ModuleType("machine")
+micropython = types.ModuleType("micropython")
+
+class Pin:
+    IN = 0
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_RISING = 1
+    IRQ_FALLING = 2
+
+    def __init__(self, id, mode=None, pull=None):
+        self.id = id
+        self.level = 1 if pull == Pin.PULL_UP else 0
+
+    def value(self):
+        return self.level
+
+    def irq(self, handler=None, trigger=None, hard=False):
+        pass
+
+machine.Pin = Pin
+machine.mem32 = None
+micropython.const = lambda x: x
+sys.modules["machine"] = machine
+sys.modules["micropython"] = micropython
+# No viper on the host, use trackball's mem32 fallback path (never called
+# here since the register source is injected)
+sys.modules["fastgpio"] = None
+_start = time.monotonic()
+time.ticks_ms = lambda: int((time.monotonic() - _start) * 1000)
+time.ticks_us = lambda: int((time.monotonic() - _start) * 1000000)
+time.ticks_diff = lambda a, b: a - b
+
+import trackball
+
+GPIO = {'gs1': 1, 'gs2': 2, 'gs3': 3, 'gs4': 10, 'gsKey': 0}
+
+def check(polls=3000, seed=7):
+    random.seed(seed)
+    ref = trackball.Trackball()
+    def read_gpio():
+        # The whole register with random levels on the other GPIOs, left
+        # unmasked so _sample_fast has to ignore them itself
+        bits = random.getrandbits(32) & ~trackball.GPIO_MASK
+        for name, gpio in GPIO.items():
+            bits |= ref._pins[name].level << gpio
+        return bits
+    fast = trackball.Trackball(read_gpio=read_gpio)
+    # Both read the same simulated pins
+    fast._pins = ref._pins
+    ref.init(0, 0)
+    fast.init(0, 0, fast_sample=True)
+    out = {ref: [], fast: []}
+    for tb in (ref, fast):
+        tb.on_move(lambda d, tb=tb: out[tb].append(('move', d)))
+        tb.on_button(lambda v, tb=tb: out[tb].append(('button', v)))
+    for _ in range(polls):
+        for pin in ref._pins.values():
+            if random.random() < 0.3:
+                pin.level ^= 1
+        ref.update()
+        fast.update()
+    if out[ref] != out[fast]:
+        print("MISMATCH")
+        for a, b in zip(out[ref], out[fast]):
+            if a != b:
+                print(f"  dict {a} fast {b}")
+                break
+        return False
+    print(f"fast sampler matches the dict path: {len(out[ref])} callbacks over {polls} polls")
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if check() else 1)
@@ -0,0 +1,68 @@
+# console.py
+# Scrolling text console for the JD9613 using hardware vertical scroll.
+# Appending a line renders only that line into panel memory and moves the
+# scroll start (VSCRSADD), the rest of the screen is never redrawn.
+# Works in ROTATION_0, the panel scrolls along its 294 px side.
+import framebuf
+import screentest_m as tft
+
+VSCRDEF = 0x33
+VSCRSADD = 0x37
+
+class Console:
+    def __init__(self, top=0, bottom=0, fg=0xFFFF, bg=0x0000, line_height=tft.FONT_HEIGHT):
+        """top/bottom are fixed rows left alone above and below the console"""
+        self.top = top
+        self.line_height = line_height
+        self.lines = (tft.DISPLAY_HEIGHT - top - bottom) // line_height
+        self.cols = tft.DISPLAY_WIDTH // tft.FONT_WIDTH
+        self.fg = tft.swap565(fg)
+        self.bg = tft.swap565(bg)
+        self.bg_color = bg
+        self._count = 0
+        self._head = 0
+        self._line_buf = bytearray(tft.DISPLAY_WIDTH * line_height * 2)
+        self._line_fb = framebuf.FrameBuffer(self._line_buf, tft.DISPLAY_WIDTH, line_height, framebuf.RGB565)
+        self._param_buf = bytearray(6)
+
+        area = self.lines * line_height
+        self._set_params(VSCRDEF, top, area, tft.DISPLAY_HEIGHT - top - area)
+        self.clear()
+
+    def _set_params(self, cmd, *values):
+        n = 0
+        for v in values:
+            self._param_buf[n] = v >> 8
+            self._param_buf[n + 1] = v & 0xFF
+            n += 2
+        tft.send_command_buf(cmd, memoryview(self._param_buf)[:n])
+
+    def clear(self):
+        self._count = 0
+        self._head = 0
+        self._set_params(VSCRSADD, self.top)
+        tft.fill_rect(0, self.top, tft.DISPLAY_WIDTH, self.lines * self.line_height, self.bg_color)
+
+    def _put_line(self, text):
+        if self._count < self.lines:
+            slot = self._count
+            self._count += 1
+        else:
+            # Full, overwrite the oldest line and scroll it to the bottom
+            slot = self._head
+            self._head = (self._head + 1) % self.lines
+        fb = self._line_fb
+        fb.fill(self.bg)
+        fb.text(text, 0, 0, self.fg)
+        y = self.top + slot * self.line_height
+        tft.blit_buffer(self._line_buf, 0, y, tft.DISPLAY_WIDTH, self.line_height)
+        if self._count == self.lines:
+            self._set_params(VSCRSADD, self.top + self._head * self.line_height)
+
+    def log(self, text):
+        """Append text, wrapping long lines and splitting on newlines"""
+        for line in str(text).split("\n"):
+            while len(line) > self.cols:
+                self._put_line(line[:self.cols])
+                line = line[self.cols:]
+            self._put_line(line)
@@ -0,0 +1,10 @@
+# fastgpio.py
+# Viper register reads for the trackball. trackball.py imports these with a
+# mem32 fallback, so ports without the viper emitter still work.
+import micropython
+
+@micropython.viper
+def read_gpio_in() -> int:
+    """Trackball bits (GPIO 0-3, 10) of the ESP32-S3 GPIO_IN register.
+    Masked here so bits 30/31 never turn the value into a heap big int."""
+    return ptr32(0x6000403C)[0] & 0x40F
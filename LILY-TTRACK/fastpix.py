@@ -0,0 +1,80 @@
+# fastpix.py
+# Viper inner loops for moving pixels around. screentest_m imports these
+# with pure Python fallbacks, so ports without the viper emitter still work.
+import micropython
+
+@micropython.viper
+def scale_row(src, start: int, n: int, dst, scale: int):
+    """Expand n framebuf RGB565 pixels from src[start:] into dst, each
+    repeated scale times and byte swapped to panel order"""
+    s = ptr8(src)
+    d = ptr8(dst)
+    i = start * 2
+    end = i + n * 2
+    j = 0
+    while i < end:
+        lo = s[i]
+        hi = s[i + 1]
+        k = 0
+        while k < scale:
+            d[j] = hi
+            d[j + 1] = lo
+            j += 2
+            k += 1
+        i += 2
+
+@micropython.viper
+def lut_row4(src, start: int, n: int, lut, dst):
+    """Expand n GS4_HMSB pixels from pixel index start through an RGB565
+    lookup table of panel ordered byte pairs"""
+    s = ptr8(src)
+    l = ptr8(lut)
+    d = ptr8(dst)
+    i = start
+    end = start + n
+    j = 0
+    while i < end:
+        b = s[i >> 1]
+        if i & 1:
+            c = (b & 0x0F) << 1
+        else:
+            c = (b >> 4) << 1
+        d[j] = l[c]
+        d[j + 1] = l[c + 1]
+        j += 2
+        i += 1
+
+@micropython.viper
+def lut_row8(src, start: int, n: int, lut, dst):
+    """Same as lut_row4 for GS8 pixels"""
+    s = ptr8(src)
+    l = ptr8(lut)
+    d = ptr8(dst)
+    i = start
+    end = start + n
+    j = 0
+    while i < end:
+        c = s[i] << 1
+        d[j] = l[c]
+        d[j + 1] = l[c + 1]
+        j += 2
+        i += 1
+
+@micropython.viper
+def rotate_cols(src, w: int, h: int, j0: int, ncols: int, i0: int, n: int, dst):
+    """Transpose RGB565 src (w x h) a quarter turn clockwise: for each source
+    column j0.. write n pixels taken bottom up, starting i0 rows from the
+    bottom, like lcd_PushColors_SoftRotation"""
+    s = ptr16(src)
+    d = ptr16(dst)
+    k = 0
+    j = j0
+    while j < j0 + ncols:
+        si = (h - 1 - i0) * w + j
+        i = 0
+        while i < n:
+            d[k] = s[si]
+            si -= w
+            k += 1
+            i += 1
+        j += 1
@@ -0,0 +1,124 @@
+# flushworker.py
+# Opt-in background flush for the JD9613. A _thread worker owns the SPI bus
+# and streams finished buffers while the main thread polls input and draws
+# the next band or frame. Buffers are handed over through a ring of slots
+# (two by default, i.e. a double buffer), each guarded by a pair of locks.
+#
+#   worker = FlushWorker()
+#   worker.start()
+#   renderer.render(worker=worker)   # or backbuffer.show(worker)
+#   worker.sync()                    # before touching the bus directly
+#
+# Between start() and stop() only the worker may talk to the panel, so call
+# sync() first if something has to use screentest_m directly.
+import _thread
+import time
+import screentest_m as tft
+
+FLUSH_BUF_SIZE = 4096
+
+class FlushWorker:
+    def __init__(self, size=FLUSH_BUF_SIZE, slots=2):
+        self.size = size
+        self.bufs = [bytearray(size) for _ in range(slots)]
+        self._mvs = [memoryview(b) for b in self.bufs]
+        self._jobs = [None] * slots
+        # _free[i] is held while slot i waits for or is being flushed,
+        # _full[i] is released once a job has been queued in it
+        self._free = [_thread.allocate_lock() for _ in range(slots)]
+        self._full = [_thread.allocate_lock() for _ in range(slots)]
+        for lock in self._full:
+            lock.acquire()
+        self._done = _thread.allocate_lock()
+        self._next = 0
+        self.running = False
+        self.flushes = 0
+        self.busy_us = 0
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        # The worker starts reading at slot 0, stop() may have left us elsewhere
+        self._next = 0
+        self._done.acquire()
+        _thread.start_new_thread(self._run, ())
+
+    def stop(self):
+        """Flush what is queued and end the worker thread"""
+        if not self.running:
+            return
+        i = self.acquire()
+        self._jobs[i] = None
+        self._next = (i + 1) % len(self.bufs)
+        self._full[i].release()
+        self._done.acquire()
+        self._done.release()
+        self._free[i].release()
+        self.running = False
+
+    def acquire(self):
+        """Wait for the next slot to be flushed and return its index, fill
+        self.bufs[i] and pass it to submit()"""
+        i = self._next
+        self._free[i].acquire()
+        return i
+
+    def submit(self, i, x, y, w, h):
+        """Queue slot i holding w x h panel ordered RGB565 pixels"""
+        self._jobs[i] = (x, y, w, h)
+        self._next = (i + 1) % len(self.bufs)
+        self._full[i].release()
+
+    def rows_per_slot(self, row_bytes):
+        """How many rows of row_bytes fit in one slot, at least one or raise"""
+        if row_bytes > self.size:
+            raise ValueError("worker slots smaller than a row")
+        return self.size // row_bytes
+
+    def push(self, mv, stride, x, y, w, h):
+        """Copy a w x h region out of a buffer with stride bytes per row
+        (starting at mv[0]) into slots and queue them"""
+        row_bytes = w * 2
+        rows = self.rows_per_slot(row_bytes)
+        src = 0
+        while h > 0:
+            n = min(rows, h)
+            i = self.acquire()
+            dst = self._mvs[i]
+            if row_bytes == stride:
+                # Full rows are contiguous, one copy
+                dst[:n * row_bytes] = mv[src:src + n * row_bytes]
+                src += n * row_bytes
+            else:
+                j = 0
+                for _ in range(n):
+                    dst[j:j + row_bytes] = mv[src:src + row_bytes]
+                    j += row_bytes
+                    src += stride
+            self.submit(i, x, y, w, n)
+            y += n
+            h -= n
+
+    def sync(self):
+        """Block until every queued slot has gone out"""
+        for lock in self._free:
+            lock.acquire()
+            lock.release()
+
+    def _run(self):
+        i = 0
+        slots = len(self.bufs)
+        while True:
+            self._full[i].acquire()
+            job = self._jobs[i]
+            if job is None:
+                break
+            x, y, w, h = job
+            start = time.ticks_us()
+            tft.blit_buffer(self._mvs[i][:w * h * 2], x, y, w, h)
+            self.busy_us += time.ticks_diff(time.ticks_us(), start)
+            self.flushes += 1
+            self._free[i].release()
+            i = (i + 1) % slots
+        self._done.release()
@@ -0,0 +1,98 @@
+# framepacer.py
+# Frame pacing for the JD9613. The init sequence turns the tearing effect
+# line on (0x35), so when the TE pin is wired we flush right after the
+# panel's vblank pulse and never tear. Without it a hardware timer gives a
+# fixed frame rate instead.
+#
+#   pacer = FramePacer(te_pin=None, fps=30)
+#   while True:
+#       draw(screen)
+#       pacer.present(screen.show)
+from machine import Pin, Timer, idle
+import time
+
+class FramePacer:
+    def __init__(self, te_pin=None, fps=30, divider=1, timer_id=0):
+        """te_pin: GPIO of the panel TE output, None to use a timer at fps.
+        divider: with TE, flush on every Nth pulse to lower the rate."""
+        self._ticks = 0
+        self._seen = 0
+        self._divider = divider
+        self._count = 0
+        self._timer = None
+        self._te = None
+        if te_pin is not None:
+            self._te = Pin(te_pin, Pin.IN)
+            self._te.irq(handler=self._on_te, trigger=Pin.IRQ_RISING)
+        else:
+            self._timer = Timer(timer_id)
+            self._timer.init(period=1000 // fps, mode=Timer.PERIODIC, callback=self._on_tick)
+        self.reset_stats()
+
+    def _on_te(self, pin):
+        self._count += 1
+        if self._count >= self._divider:
+            self._count = 0
+            self._ticks += 1
+
+    def _on_tick(self, timer):
+        self._ticks += 1
+
+    def reset_stats(self):
+        self.frames = 0
+        self.dropped = 0
+        self._last = None
+        self._min_us = 0
+        self._max_us = 0
+        self._sum_us = 0
+        self._flush_max_us = 0
+        self._flush_sum_us = 0
+
+    def wait(self):
+        """Block until the next vblank or timer tick"""
+        while self._ticks == self._seen:
+            idle()
+        ticks = self._ticks
+        # Pulses that went by while we were still busy are lost frames
+        if self.frames:
+            self.dropped += ticks - self._seen - 1
+        self._seen = ticks
+
+    def present(self, flush):
+        """Wait for the next frame slot, call flush() and record timings"""
+        self.wait()
+        start = time.ticks_us()
+        flush()
+        end = time.ticks_us()
+        took = time.ticks_diff(end, start)
+        self._flush_sum_us += took
+        if took > self._flush_max_us:
+            self._flush_max_us = took
+        if self._last is not None:
+            interval = time.ticks_diff(start, self._last)
+            self._sum_us += interval
+            if self.frames == 1 or interval < self._min_us:
+                self._min_us = interval
+            if interval > self._max_us:
+                self._max_us = interval
+        self._last = start
+        self.frames += 1
+
+    def stats(self):
+        """Frame interval min/avg/max and flush avg/max in us, frame counts"""
+        intervals = max(self.frames - 1, 1)
+        return {
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "min_us": self._min_us,
+            "avg_us": self._sum_us // intervals,
+            "max_us": self._max_us,
+            "flush_avg_us": self._flush_sum_us // max(self.frames, 1),
+            "flush_max_us": self._flush_max_us,
+        }
+
+    def deinit(self):
+        if self._te is not None:
+            self._te.irq(handler=None)
+        if self._timer is not None:
+            self._timer.deinit()
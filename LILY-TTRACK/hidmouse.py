@@ -0,0 +1,97 @@
+# hidmouse.py
+# USB HID mouse for the T-Track on MicroPython (ESP32-S3 native USB, needs
+# the usb-device-mouse package from micropython-lib). Trackball movement is
+# accumulated and sent as at most one report per USB poll interval, so a
+# fast spin does not flood the stack with one report per edge.
+#
+#   mpremote mip install usb-device-mouse
+#   import hidmouse; hidmouse.main()
+import time
+from trackball import Trackball
+
+def usb_mouse():
+    """Register a HID mouse with the USB stack and return it. The endpoint
+    poll interval is fixed by usb-device-hid, rate_hz below only paces how
+    often TrackballMouse sends."""
+    import usb.device
+    from usb.device.mouse import MouseInterface
+    m = MouseInterface()
+    usb.device.get().init(m, builtin_driver=True)
+    return m
+
+class TrackballMouse:
+    def __init__(self, tb, hid=None, rate_hz=125, sensitivity=16, curve=None):
+        """tb: an init()ed Trackball, switched to adaptive aggregation here.
+        hid: anything with send_report(dx, dy) and click_left(down), like
+        usb.device.mouse.MouseInterface, defaults to a new USB mouse.
+        rate_hz: reports per second at most, the ball is still sampled
+        every poll_interval_ms of tb in between.
+        sensitivity: counts to pixels in 1/16 steps, or an acceleration
+        curve as for Trackball.set_acceleration()."""
+        self.tb = tb
+        self.interval_ms = max(1, 1000 // rate_hz)
+        self.hid = hid if hid is not None else usb_mouse()
+        self._dx = 0
+        self._dy = 0
+        self._button = None
+        self._sent_button = None
+        self.reports = 0
+        tb.set_adaptive()
+        tb.set_acceleration(curve or ((0, sensitivity),))
+        tb.on_move(self._on_move)
+        tb.on_button(self._on_button)
+
+    def _on_move(self, delta):
+        self._dx += delta[0]
+        self._dy += delta[1]
+
+    def _on_button(self, level):
+        # Pulled up, pressed reads 0
+        self._button = not level
+
+    def tick(self):
+        """Poll the ball and send a report"""
+        self.tb.update()
+        self.report()
+
+    def report(self):
+        """Send one report if anything changed. A button change goes out on
+        its own, movement waits for the next report."""
+        if self._button is not None and self._button != self._sent_button:
+            if self.hid.click_left(self._button) is not False:
+                self._sent_button = self._button
+                self.reports += 1
+            return
+        dx = self._dx
+        dy = self._dy
+        if not (dx or dy):
+            return
+        # Report fields are signed bytes, the rest waits for the next tick
+        dx = max(-127, min(127, dx))
+        dy = max(-127, min(127, dy))
+        if self.hid.send_report(dx, dy) is not False:
+            self._dx -= dx
+            self._dy -= dy
+            self.reports += 1
+
+    def run(self):
+        """Sample the ball every millisecond, report every interval_ms"""
+        next_report = time.ticks_ms()
+        while True:
+            self.tb.update()
+            now = time.ticks_ms()
+            if time.ticks_diff(now, next_report) >= 0:
+                self.report()
+                next_report = time.ticks_add(next_report, self.interval_ms)
+                if time.ticks_diff(now, next_report) >= 0:
+                    # Fell behind, don't try to catch up with a burst
+                    next_report = time.ticks_add(now, self.interval_ms)
+            time.sleep_ms(1)
+
+def main(rate_hz=125, sensitivity=48):
+    tb = Trackball()
+    tb.init(poll_interval_ms=1, fast_sample=True, adaptive=True)
+    TrackballMouse(tb, rate_hz=rate_hz, sensitivity=sensitivity).run()
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,16 @@
 import board
 import busio
-import digitalio
+import displayio
 import time
+import vectorio
 
-# Configure SPI bus
-spi = busio.SPI(clock=board.IO5, MOSI=board.IO6)
-
-# Configure display pins
-tft_cs = digitalio.DigitalInOut(board.IO9)
-tft_dc = digitalio.DigitalInOut(board.IO7)
-tft_reset = digitalio.DigitalInOut(board.IO8)
-tft_bl = digitalio.DigitalInOut(board.IO10)
-
-tft_cs.direction = digitalio.Direction.OUTPUT
-tft_dc.direction = digitalio.Direction.OUTPUT
-tft_reset.direction = digitalio.Direction.OUTPUT
-tft_bl.direction = digitalio.Direction.OUTPUT
+try:
+    # CircuitPython 9 moved the bus and display classes out of displayio
+    from fourwire import FourWire
+    from busdisplay import BusDisplay
+except ImportError:
+    from displayio import FourWire
+    from displayio import Display as BusDisplay
 
 # Display dimensions
 DISPLAY_WIDTH = 126
@@ -27,9 +22,6 @@ ROTATION_90 = 1
 ROTATION_180 = 2
 ROTATION_270 = 3
 
-# Current rotation
-current_rotation = ROTATION_0
-
 JD9613_CMD = [
     (0xFE, [0x01], 0x02),
     (0xF7, [0x96, 0x13, 0xA9], 0x04),
@@ -121,106 +113,63 @@ JD9613_CMD = [
     (0x29, [0x00], 0x81),
 ]
 
-def init_display():
-    # Reset display
-    tft_reset.value = False
-    time.sleep(0.1)
-    tft_reset.value = True
-    time.sleep(0.1)
-
-    # Initialize display
-    for cmd in JD9613_CMD:
-        send_command(cmd[0])
-        for param in cmd[1]:
-            send_data(param)
-        if cmd[2] & 0x80:
-            time.sleep(0.12)
-
-    # Turn on backlight
-    tft_bl.value = True
-
-def send_command(cmd):
-    tft_dc.value = False
-    tft_cs.value = False
-    spi.try_lock()
-    try:
-        spi.configure(baudrate=80000000, phase=0, polarity=0)
-        spi.write(bytes([cmd]))
-    finally:
-        spi.unlock()
-    tft_cs.value = True
-
-def send_data(data):
-    tft_dc.value = True
-    tft_cs.value = False
-    spi.try_lock()
-    try:
-        spi.configure(baudrate=80000000, phase=0, polarity=0)
-        spi.write(bytes([data]))
-    finally:
-        spi.unlock()
-    tft_cs.value = True
+def pack_init_sequence(cmds):
+    """Convert the table above to the displayio init format: cmd, param
+    count (0x80 set when a delay byte in ms follows), params"""
+    seq = bytearray()
+    for cmd, params, flags in cmds:
+        delay = flags & 0x80
+        seq.append(cmd)
+        seq.append(len(params) | delay)
+        seq.extend(bytes(params))
+        if delay:
+            seq.append(120)
+    return bytes(seq)
+
+# MADCTL BGR, displayio does rotation itself by changing the address order
+INIT_SEQUENCE = pack_init_sequence(JD9613_CMD) + b"\x36\x01\x08"
 
-def set_rotation(rotation):
-    global current_rotation
-    current_rotation = rotation % 4
-    send_command(0x36)  # MADCTL
-    if current_rotation == ROTATION_0:
-        send_data(0x08)  # BGR
-    elif current_rotation == ROTATION_90:
-        send_data(0x68)  # MX | MV | BGR
-    elif current_rotation == ROTATION_180:
-        send_data(0xC8)  # MX | MY | BGR
-    elif current_rotation == ROTATION_270:
-        send_data(0xA8)  # MV | MY | BGR
-
-def set_window(x, y, w, h):
-    if current_rotation == ROTATION_90 or current_rotation == ROTATION_270:
-        x, y, w, h = y, x, h, w
-
-    send_command(0x2A)  # Column address set
-    send_data(x >> 8)
-    send_data(x & 0xFF)
-    send_data((x + w - 1) >> 8)
-    send_data((x + w - 1) & 0xFF)
-
-    send_command(0x2B)  # Row address set
-    send_data(y >> 8)
-    send_data(y & 0xFF)
-    send_data((y + h - 1) >> 8)
-    send_data((y + h - 1) & 0xFF)
-
-    send_command(0x2C)  # Memory write
-
-def fill_rect(x, y, w, h, color):
-    set_window(x, y, w, h)
-    tft_dc.value = True
-    tft_cs.value = False
-    spi.try_lock()
-    try:
-        spi.configure(baudrate=80000000, phase=0, polarity=0)
-        for _ in range(w * h):
-            spi.write(bytes([color >> 8, color & 0xFF]))
-    finally:
-        spi.unlock()
-    tft_cs.value = True
+def init_display():
+    """Hand the panel to the displayio core, which resets it, sends the init
+    sequence and from then on refreshes only the areas that changed"""
+    displayio.release_displays()
+    spi = busio.SPI(clock=board.IO5, MOSI=board.IO6)
+    bus = FourWire(spi, command=board.IO7, chip_select=board.IO9,
+                   reset=board.IO8, baudrate=80000000, polarity=0, phase=0)
+    return BusDisplay(bus, INIT_SEQUENCE, width=DISPLAY_WIDTH, height=DISPLAY_HEIGHT,
+                      backlight_pin=board.IO10)
+
+def rgb565_to_888(color):
+    r = (color >> 11) & 0x1F
+    g = (color >> 5) & 0x3F
+    b = color & 0x1F
+    return ((r << 3 | r >> 2) << 16) | ((g << 2 | g >> 4) << 8) | (b << 3 | b >> 2)
+
+def fill_rect(group, x, y, w, h, color):
+    """Add a solid RGB565 rectangle to group"""
+    palette = displayio.Palette(1)
+    palette[0] = rgb565_to_888(color)
+    group.append(vectorio.Rectangle(pixel_shader=palette, x=x, y=y, width=w, height=h))
+
+def test_screen(display, bg, fg):
+    group = displayio.Group()
+    w = display.width
+    h = display.height
+    fill_rect(group, 0, 0, w, h, bg)
+    fill_rect(group, 20, 20, w - 40, h - 40, fg)
+    display.root_group = group
 
 # Initialize the display
-init_display()
-
-# Set initial rotation (0 degrees)
-set_rotation(ROTATION_0)
+display = init_display()
 
 # Test the display by drawing some rectangles
-fill_rect(0, 0, DISPLAY_WIDTH, DISPLAY_HEIGHT, 0x07E0)  # Green background
-fill_rect(20, 20, DISPLAY_WIDTH - 40, DISPLAY_HEIGHT - 40, 0xF800)  # Red rectangle
+test_screen(display, 0x07E0, 0xF800)  # Red rectangle on green
 
 # Rotate the display and draw more rectangles
 for rotation in range(4):
     time.sleep(2)  # Wait for 2 seconds before changing rotation
-    set_rotation(rotation)
-    fill_rect(0, 0, DISPLAY_WIDTH, DISPLAY_HEIGHT, 0x001F)  # Blue background
-    fill_rect(20, 20, DISPLAY_WIDTH - 40, DISPLAY_HEIGHT - 40, 0xFFE0)  # Yellow rectangle
+    display.rotation = rotation * 90
+    test_screen(display, 0x001F, 0xFFE0)  # Yellow rectangle on blue
 
 while True:
-    pass
\ No newline at end of file
+    pass
@@ -2,9 +2,33 @@ from machine import Pin, SPI
 import time
 import JD9613
 import framebuf
+import struct
 
 from machine import mem32
 
+try:
+    from fastpix import scale_row, rotate_cols
+except (ImportError, SyntaxError):
+    def rotate_cols(src, w, h, j0, ncols, i0, n, dst):
+        k = 0
+        for j in range(j0, j0 + ncols):
+            si = ((h - 1 - i0) * w + j) * 2
+            for _ in range(n):
+                dst[k] = src[si]
+                dst[k + 1] = src[si + 1]
+                si -= w * 2
+                k += 2
+
+    def scale_row(src, start, n, dst, scale):
+        j = 0
+        for i in range(start * 2, (start + n) * 2, 2):
+            lo = src[i]
+            hi = src[i + 1]
+            for _ in range(scale):
+                dst[j] = hi
+                dst[j + 1] = lo
+                j += 2
+
 # This is needed for screen to not conflict with trackball.
 #pinPWR = Pin(4, Pin.OUT)
 #pinPWR.on()
@@ -50,6 +74,39 @@ CURSOR_SIZE = 5
 CURSOR_COLOR = 0xFFFF  # White
 BG_COLOR = 0x0000  # Black
 
+# Fill buffer: preallocated once and streamed in a few large writes.
+# 4 KB covers a full 126 px row 16 times, so a full screen clear is ~18 writes.
+FILL_BUF_SIZE = 4096
+_fill_buf = bytearray(FILL_BUF_SIZE)
+_fill_mv = memoryview(_fill_buf)
+_fill_fb = framebuf.FrameBuffer(_fill_buf, FILL_BUF_SIZE // 2, 1, framebuf.RGB565)
+_fill_color = None
+
+# Scratch buffers for command/parameter writes, and the last address window
+# sent to the panel so unchanged CASET/RASET can be skipped.
+_cmd_buf = bytearray(1)
+_addr_buf = bytearray(4)
+_win_cols = -1
+_win_rows = -1
+
+# Output row for draw_scaled_text, grown on demand for very wide labels
+_row_buf = bytearray(DISPLAY_HEIGHT * 2)
+
+# Read buffer for blit_rle_file, holds at least one whole packet
+RLE_PACKET_MAX = 1 + 128 * 2
+_rle_buf = bytearray(512)
+_rle_mv = memoryview(_rle_buf)
+
+# Clip rectangle, x0/y0 inclusive and x1/y1 exclusive, in the current
+# rotation. Everything drawn through this module is cut to it first.
+_clip_x0 = 0
+_clip_y0 = 0
+_clip_x1 = DISPLAY_WIDTH
+_clip_y1 = DISPLAY_HEIGHT
+
+# Byte budget for cached rendered labels, see LabelCache
+LABEL_CACHE_BYTES = 16384
+
 def bl_on():
     backlight = Pin(10, Pin.OUT)
     backlight.value(1)
@@ -105,13 +162,8 @@ def init_display():
     time.sleep_ms(100)
 
     # Initialize display
-    for cmd in JD9613.CMD:
-        #print(hex(cmd[0]))
-        send_command(cmd[0])
-        for param in cmd[1]:
-            send_data(param)
-        if cmd[2] & 0x80:
-            time.sleep_ms(120)
+    JD9613.init(spi, tft_cs, tft_dc)
+    invalidate_window()
 
     # Turn on backlight
     bl_on()
@@ -120,9 +172,10 @@ def init_display():
     
     
 def send_command(cmd):
+    _cmd_buf[0] = cmd
     tft_dc.value(0)
     tft_cs.value(0)
-    spi.write(bytes([cmd]))
+    spi.write(_cmd_buf)
     tft_cs.value(1)
 
 def send_data(data):
@@ -131,9 +184,35 @@ def send_data(data):
     spi.write(bytes([data]))
     tft_cs.value(1)
 
+def send_command_buf(cmd, buf):
+    """Send cmd and its parameter bytes in one CS frame"""
+    _cmd_buf[0] = cmd
+    tft_cs.value(0)
+    tft_dc.value(0)
+    spi.write(_cmd_buf)
+    tft_dc.value(1)
+    spi.write(buf)
+    tft_cs.value(1)
+
+def send_address(cmd, start, end):
+    """Send CASET/RASET with its 4 parameter bytes in one CS frame"""
+    _addr_buf[0] = start >> 8
+    _addr_buf[1] = start & 0xFF
+    _addr_buf[2] = end >> 8
+    _addr_buf[3] = end & 0xFF
+    send_command_buf(cmd, _addr_buf)
+
+def invalidate_window():
+    """Forget the cached address window, call after raw 0x2A/0x2B writes"""
+    global _win_cols, _win_rows
+    _win_cols = -1
+    _win_rows = -1
+
 def set_rotation(rotation):
     global current_rotation
     current_rotation = rotation % 4
+    invalidate_window()
+    reset_clip()
     send_command(0x36)  # MADCTL
     if current_rotation == ROTATION_0:
         send_data(0x08)  # BGR
@@ -144,88 +223,389 @@ def set_rotation(rotation):
     elif current_rotation == ROTATION_270:
         send_data(0xA8)  # MV | MY | BGR
 
+def screen_size():
+    """(width, height) in the current rotation"""
+    if current_rotation == ROTATION_90 or current_rotation == ROTATION_270:
+        return DISPLAY_HEIGHT, DISPLAY_WIDTH
+    return DISPLAY_WIDTH, DISPLAY_HEIGHT
+
+def set_clip(x, y, w, h):
+    """Restrict all drawing to a viewport, always kept inside the screen"""
+    global _clip_x0, _clip_y0, _clip_x1, _clip_y1
+    sw, sh = screen_size()
+    _clip_x0 = max(x, 0)
+    _clip_y0 = max(y, 0)
+    _clip_x1 = min(x + w, sw)
+    _clip_y1 = min(y + h, sh)
+
+def reset_clip():
+    sw, sh = screen_size()
+    set_clip(0, 0, sw, sh)
+
+def clip_rect(x, y, w, h):
+    """The part of a rectangle inside the clip as (x0, y0, x1, y1), x1/y1
+    exclusive, or None when nothing is left"""
+    x0 = max(x, _clip_x0)
+    y0 = max(y, _clip_y0)
+    x1 = min(x + w, _clip_x1)
+    y1 = min(y + h, _clip_y1)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return x0, y0, x1, y1
+
 def set_window(x, y, w, h):
+    global _win_cols, _win_rows
     if current_rotation == ROTATION_90 or current_rotation == ROTATION_270:
         x, y, w, h = y, x, h, w
 
-    send_command(0x2A)  # Column address set
-    send_data(x >> 8)
-    send_data(x & 0xFF)
-    send_data((x + w - 1) >> 8)
-    send_data((x + w - 1) & 0xFF)
-
-    send_command(0x2B)  # Row address set
-    send_data(y >> 8)
-    send_data(y & 0xFF)
-    send_data((y + h - 1) >> 8)
-    send_data((y + h - 1) & 0xFF)
+    cols = (x << 16) | (x + w - 1)
+    if cols != _win_cols:
+        send_address(0x2A, x, x + w - 1)  # Column address set
+        _win_cols = cols
+    rows = (y << 16) | (y + h - 1)
+    if rows != _win_rows:
+        send_address(0x2B, y, y + h - 1)  # Row address set
+        _win_rows = rows
 
     send_command(0x2C)  # Memory write
 
-def fill_rect(x, y, w, h, color):
-    set_window(x, y, w, h)
+def swap565(color):
+    """framebuf stores RGB565 little endian, the panel wants high byte first"""
+    return ((color & 0xFF) << 8) | (color >> 8)
+
+def _set_fill_color(color):
+    global _fill_color
+    if color != _fill_color:
+        _fill_fb.fill(swap565(color))
+        _fill_color = color
+
+def write_buf(buf):
+    """Stream panel ordered RGB565 bytes into the current window"""
     tft_dc.value(1)
     tft_cs.value(0)
-    for _ in range(w * h):
-        spi.write(bytes([color >> 8, color & 0xFF]))
+    spi.write(buf)
     tft_cs.value(1)
 
-def create_text_framebuf(text, color):
+def blit_buffer(buf, x, y, w, h, stride=None):
+    """Send a w x h panel ordered buffer, only the part inside the clip.
+    stride is the buffer's row length in pixels when it is wider than w."""
+    if stride is None:
+        stride = w
+    x0 = max(x, _clip_x0)
+    y0 = max(y, _clip_y0)
+    x1 = min(x + w, _clip_x1)
+    y1 = min(y + h, _clip_y1)
+    if x1 <= x0 or y1 <= y0:
+        return
+    if x0 == x and x1 == x + w and stride == w:
+        set_window(x, y0, w, y1 - y0)
+        if y0 == y and y1 == y + h:
+            write_buf(buf)
+        else:
+            write_buf(memoryview(buf)[(y0 - y) * w * 2:(y1 - y) * w * 2])
+        return
+    # Partly outside left or right or strided, send the visible slice of
+    # each row
+    set_window(x0, y0, x1 - x0, y1 - y0)
+    mv = memoryview(buf)
+    start = ((y0 - y) * stride + x0 - x) * 2
+    n = (x1 - x0) * 2
+    tft_dc.value(1)
+    tft_cs.value(0)
+    for _ in range(y1 - y0):
+        spi.write(mv[start:start + n])
+        start += stride * 2
+    tft_cs.value(1)
+
+def blit_rotated(buf, x, y, w, h):
+    """Blit a w x h landscape buffer at landscape x, y while the panel stays
+    in ROTATION_0, transposing in software like lcd_PushColors_SoftRotation"""
+    global _fill_color
+    # Portrait window: source columns become rows, source rows bottom up
+    # become columns
+    px = DISPLAY_WIDTH - (y + h)
+    py = x
+    u0 = max(px, _clip_x0)
+    v0 = max(py, _clip_y0)
+    u1 = min(px + h, _clip_x1)
+    v1 = min(py + w, _clip_y1)
+    if u1 <= u0 or v1 <= v0:
+        return
+    n = u1 - u0
+    set_window(u0, v0, n, v1 - v0)
+    # The fill buffer holds as many transposed columns as fit
+    _fill_color = None
+    per_chunk = max(1, FILL_BUF_SIZE // (n * 2))
+    tft_dc.value(1)
+    tft_cs.value(0)
+    j = v0 - py
+    end = v1 - py
+    while j < end:
+        cols = min(per_chunk, end - j)
+        rotate_cols(buf, w, h, j, cols, u0 - px, n, _fill_buf)
+        spi.write(_fill_mv[:cols * n * 2])
+        j += cols
+    tft_cs.value(1)
+
+def _stream_color(color, count):
+    """Send count pixels of color, CS and DC must already be set for data"""
+    _set_fill_color(color)
+    n = count * 2
+    while n >= FILL_BUF_SIZE:
+        spi.write(_fill_buf)
+        n -= FILL_BUF_SIZE
+    if n:
+        spi.write(_fill_mv[:n])
+
+def write_color(color, count):
+    """Stream count pixels of color into the current window"""
+    tft_dc.value(1)
+    tft_cs.value(0)
+    _stream_color(color, count)
+    tft_cs.value(1)
+
+def fill_rect(x, y, w, h, color):
+    x0 = max(x, _clip_x0)
+    y0 = max(y, _clip_y0)
+    x1 = min(x + w, _clip_x1)
+    y1 = min(y + h, _clip_y1)
+    if x1 <= x0 or y1 <= y0:
+        return
+    set_window(x0, y0, x1 - x0, y1 - y0)
+    write_color(color, (x1 - x0) * (y1 - y0))
+
+def read_image_header(f, magic=b"R565"):
+    """Read the header written by tools/img2rgb565.py, returns (w, h)"""
+    tag, w, h = struct.unpack("<4sHH", f.read(8))
+    if tag != magic:
+        raise ValueError("not a %s image" % magic.decode())
+    return w, h
+
+def blit_file(path, x, y):
+    """Stream an RGB565 image file to the panel through the fill buffer,
+    so the image never has to fit in RAM"""
+    global _fill_color
+    with open(path, "rb") as f:
+        w, h = read_image_header(f)
+        x0 = max(x, _clip_x0)
+        y0 = max(y, _clip_y0)
+        x1 = min(x + w, _clip_x1)
+        y1 = min(y + h, _clip_y1)
+        if x1 <= x0 or y1 <= y0:
+            return
+        set_window(x0, y0, x1 - x0, y1 - y0)
+        # The fill buffer is reused as the chunk buffer
+        _fill_color = None
+        tft_dc.value(1)
+        tft_cs.value(0)
+        if x0 == x and x1 == x + w and y0 == y and y1 == y + h:
+            while True:
+                n = f.readinto(_fill_buf)
+                if not n:
+                    break
+                spi.write(_fill_mv[:n])
+        else:
+            # Clipped, read whole rows and send the visible part
+            row = _fill_mv[:w * 2]
+            visible = row[(x0 - x) * 2:(x1 - x) * 2]
+            f.seek(8 + (y0 - y) * w * 2)
+            for _ in range(y1 - y0):
+                f.readinto(row)
+                spi.write(visible)
+        tft_cs.value(1)
+
+def blit_rle_file(path, x, y):
+    """Stream an RLE image from tools/img2rgb565.py --rle to the panel.
+
+    Packets are a control byte c, then either one color repeated
+    (c & 0x7F) + 1 times when c & 0x80 is set, or c + 1 literal pixels.
+    Back to back runs of one color are merged into a single fill burst.
+    """
+    with open(path, "rb") as f:
+        w, h = read_image_header(f, b"RLE5")
+        # Visible columns c0..c1 and rows r0..r1 of the image
+        c0 = max(_clip_x0 - x, 0)
+        r0 = max(_clip_y0 - y, 0)
+        c1 = min(_clip_x1 - x, w)
+        r1 = min(_clip_y1 - y, h)
+        if c1 <= c0 or r1 <= r0:
+            return
+        clipped = c0 or r0 or c1 < w or r1 < h
+        set_window(x + c0, y + r0, c1 - c0, r1 - r0)
+        buf = _rle_buf
+        mv = _rle_mv
+        n = f.readinto(buf)
+        i = 0
+        pos = 0
+        end = r1 * w
+        run_color = -1
+        run_count = 0
+        tft_dc.value(1)
+        tft_cs.value(0)
+        while pos < end:
+            if n - i < RLE_PACKET_MAX:
+                # Keep a whole packet in the buffer
+                rest = n - i
+                mv[:rest] = mv[i:n]
+                n = rest + (f.readinto(mv[rest:]) or 0)
+                i = 0
+                if n == 0:
+                    break
+            c = buf[i]
+            if c & 0x80:
+                count = (c & 0x7F) + 1
+                color = (buf[i + 1] << 8) | buf[i + 2]
+                i += 3
+                lit = -1
+            else:
+                count = c + 1
+                lit = i + 1
+                i += 1 + count * 2
+            # Split the packet into row segments when clipping
+            seg_pos = pos
+            left = count
+            while left:
+                if clipped:
+                    row = seg_pos // w
+                    col = seg_pos - row * w
+                    seg = min(left, w - col)
+                    a = max(col, c0)
+                    b = min(col + seg, c1)
+                    if row < r0 or row >= r1 or a >= b:
+                        a = b = 0
+                else:
+                    col = seg_pos
+                    seg = left
+                    a = col
+                    b = col + seg
+                if b > a:
+                    if lit < 0:
+                        if color != run_color and run_count:
+                            _stream_color(run_color, run_count)
+                            run_count = 0
+                        run_color = color
+                        run_count += b - a
+                    else:
+                        if run_count:
+                            _stream_color(run_color, run_count)
+                            run_count = 0
+                        off = lit + (seg_pos - pos + a - col) * 2
+                        spi.write(mv[off:off + (b - a) * 2])
+                seg_pos += seg
+                left -= seg
+            pos += count
+        if run_count:
+            _stream_color(run_color, run_count)
+        tft_cs.value(1)
+
+def create_text_framebuf(text, color, bg=0):
     buf_width = len(text) * FONT_WIDTH
     buf_height = FONT_HEIGHT
     buf = bytearray(buf_width * buf_height * 2)
     fb = framebuf.FrameBuffer(buf, buf_width, buf_height, framebuf.RGB565)
-    fb.fill(0)
+    fb.fill(bg)
     fb.text(text, 0, 0, color)
     return fb
 
-def draw_text(x, y, text, color):
-    fb = create_text_framebuf(text, color)
+def render_label(text, color, bg=0, scale=1):
+    """Render text into a panel ordered buffer, returns (buf, w, h)"""
+    fb = create_text_framebuf(text, color, bg)
     buf_width = len(text) * FONT_WIDTH
-    buf_height = FONT_HEIGHT
-    
-    set_window(x, y, buf_width, buf_height)
-    tft_dc.value(1)
-    tft_cs.value(0)
-    spi.write(fb)
-    tft_cs.value(1)
-
-def draw_scaled_text(x, y, text, color, scale=1):
-    fb = create_text_framebuf(text, color)
+    w = buf_width * scale
+    h = FONT_HEIGHT * scale
+    row_bytes = w * 2
+    buf = bytearray(row_bytes * h)
+    mv = memoryview(buf)
+    src = memoryview(fb)
+    off = 0
+    for r in range(FONT_HEIGHT):
+        first = mv[off:off + row_bytes]
+        scale_row(src, r * buf_width, buf_width, first, scale)
+        off += row_bytes
+        for _ in range(scale - 1):
+            mv[off:off + row_bytes] = first
+            off += row_bytes
+    return buf, w, h
+
+class LabelCache:
+    """LRU cache of rendered labels keyed by (text, fg, bg, scale)"""
+    def __init__(self, budget=LABEL_CACHE_BYTES):
+        self.budget = budget
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        # Keys, least recently used first
+        self._order = []
+
+    def get(self, text, color, bg=0, scale=1):
+        """Return (buf, w, h), or None when the label is bigger than the budget"""
+        key = (text, color, bg, scale)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            if self._order[-1] != key:
+                self._order.remove(key)
+                self._order.append(key)
+            return entry
+        self.misses += 1
+        size = len(text) * FONT_WIDTH * FONT_HEIGHT * scale * scale * 2
+        if size > self.budget:
+            return None
+        while self.used + size > self.budget:
+            old = self._order.pop(0)
+            self.used -= len(self._entries.pop(old)[0])
+        entry = render_label(text, color, bg, scale)
+        self._entries[key] = entry
+        self._order.append(key)
+        self.used += size
+        return entry
+
+    def clear(self):
+        self._entries = {}
+        self._order = []
+        self.used = 0
+
+label_cache = LabelCache()
+
+def draw_text(x, y, text, color, bg=0):
+    draw_scaled_text(x, y, text, color, 1, bg)
+
+def draw_scaled_text(x, y, text, color, scale=1, bg=0):
+    global _row_buf
+    entry = label_cache.get(text, color, bg, scale)
+    if entry is not None:
+        blit_buffer(entry[0], x, y, entry[1], entry[2])
+        return
+
+    # Too big to cache, stream it without building the whole label
     buf_width = len(text) * FONT_WIDTH
     buf_height = FONT_HEIGHT
-    
-    set_window(x, y, buf_width * scale, buf_height * scale)
+    w = buf_width * scale
+    x0 = max(x, _clip_x0)
+    y0 = max(y, _clip_y0)
+    x1 = min(x + w, _clip_x1)
+    y1 = min(y + buf_height * scale, _clip_y1)
+    if x1 <= x0 or y1 <= y0:
+        return
+    fb = create_text_framebuf(text, color, bg)
+    row_bytes = w * 2
+    if row_bytes > len(_row_buf):
+        _row_buf = bytearray(row_bytes)
+    row = memoryview(_row_buf)[(x0 - x) * 2:(x1 - x) * 2]
+    src = memoryview(fb)
+
+    set_window(x0, y0, x1 - x0, y1 - y0)
     tft_dc.value(1)
     tft_cs.value(0)
-    
-    for row in range(buf_height):
-        for _ in range(scale):
-            for col in range(buf_width):
-                pixel = fb.pixel(col, row)
-                for _ in range(scale):
-                    spi.write(bytes([pixel >> 8, pixel & 0xFF]))
-    
+    # Expand each source row once, then send it scale times
+    for r in range((y0 - y) // scale, (y1 - y + scale - 1) // scale):
+        scale_row(src, r * buf_width, buf_width, _row_buf, scale)
+        top = y + r * scale
+        for _ in range(min(top + scale, y1) - max(top, y0)):
+            spi.write(row)
     tft_cs.value(1)
     
-class Cursor:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.last_x = x
-        self.last_y = y
-
-    def draw(self):
-        fill_rect(self.x, self.y, CURSOR_SIZE, CURSOR_SIZE, CURSOR_COLOR)
-
-    def erase(self):
-        fill_rect(self.last_x, self.last_y, CURSOR_SIZE, CURSOR_SIZE, BG_COLOR)
-
-    def move(self, new_x, new_y):
-        self.last_x = self.x
-        self.last_y = self.y
-        self.x = new_x
-        self.y = new_y
 # Initialize the display
 #reset_display()
 
@@ -258,42 +638,61 @@ def main():
     power_mode = read_display_power_mode()
     print(f"Display Power Mode: {power_mode:08b}")
     
-    from trackball import Trackball
+    from trackball import Trackball, EVENT_MOVE
+    import asyncio
     trackball = Trackball()
-    trackball.init(poll_interval_ms=10, aggregation_interval_ms=100)
+    trackball.init(poll_interval_ms=10, aggregation_interval_ms=100, adaptive=True, use_irq=True)
+    # 2x when moving slowly, up to 5x on fast spins (counts per second)
+    trackball.set_acceleration(((0, 32), (40, 48), (120, 80)))
     
+    # Draw into a back buffer so the cursor sprite can restore what it covers
+    from backbuffer import BackBuffer
+    from sprite import Sprite
+    screen = BackBuffer()
+
     print("rect filling")
-    fill_rect(0, 50, DISPLAY_WIDTH, DISPLAY_HEIGHT, 0x01E0)
+    screen.fill(BG_COLOR)
+    screen.fill_rect(0, 50, DISPLAY_WIDTH, DISPLAY_HEIGHT, 0x01E0)
     # Test the display by drawing some rectangles
     #fill_rect(0, 0, DISPLAY_WIDTH, DISPLAY_HEIGHT, 0x07E0)  # Green background
     #fill_rect(20, 20, DISPLAY_WIDTH - 40, DISPLAY_HEIGHT - 40, 0xF800)  # Red rectangle
     # Example usage
     print("outing text")
-    draw_text(10, 10, "Hello, World!", 0xFFFF)  # White text
-    draw_text(10, 30, "LilyGo T-Track", 0xF800)  # Red text
+    screen.text("Hello, World!", 10, 10, 0xFFFF)  # White text
+    screen.text("LilyGo T-Track", 10, 30, 0xF800)  # Red text
+    screen.show()
     time.sleep(2)
 #    print("outing rect")
 #    fill_rect(0, 50, DISPLAY_WIDTH, DISPLAY_HEIGHT, 0x07E0)  # Green background
 
 
-    cursor = Cursor(DISPLAY_WIDTH // 2, DISPLAY_HEIGHT // 2)
+    cursor = Sprite(screen, CURSOR_SIZE, CURSOR_SIZE, CURSOR_COLOR)
+    cursor.move(DISPLAY_WIDTH // 2, DISPLAY_HEIGHT // 2)
     
     def on_move(delta):
         print(f"Movement detected: {delta}")
-        cursor.erase()
-        cursor.move(cursor.x + delta[0]*2, cursor.y+delta[1]*2)
-        cursor.draw()
+        # Keep the cursor on screen
+        x = min(max(cursor.x + delta[0], 0), DISPLAY_WIDTH - CURSOR_SIZE)
+        y = min(max(cursor.y + delta[1], 0), DISPLAY_HEIGHT - CURSOR_SIZE)
+        cursor.move(x, y)
     def on_btn(a):
-        draw_text(10, 50, battery.get_string(), 0xF8F0)
+        text = battery.get_string()
+        screen.fill_rect(10, 50, len(text) * FONT_WIDTH, FONT_HEIGHT, 0x01E0)
+        screen.text(text, 10, 50, 0xF8F0)
+        screen.show()
         
-    trackball.on_move(on_move)
-    trackball.on_button(on_btn)
+    async def input_loop():
+        # Sleeps between trackball edges, other tasks can share the loop
+        async for ev, dx, dy, t in trackball.events():
+            if ev == EVENT_MOVE:
+                on_move((dx, dy))
+            else:
+                on_btn(dx)
+
     # Clear screen
     #fill_rect(0, 0, DISPLAY_WIDTH, DISPLAY_HEIGHT, BG_COLOR)
     print("entering loop")
-    while True:
-        trackball.update()
-        time.sleep_ms(1)
+    asyncio.run(input_loop())
          # Red text
         #sleep_out()
         #print(tft_bl.value())
@@ -305,7 +704,10 @@ def main():
         #print(f"Display Status: {status}")
 
 # Run the main loop
-main()
+if __name__ == "__main__":
+    # Run through the imported module so backbuffer/sprite share its state
+    import screentest_m
+    screentest_m.main()
 
 
 
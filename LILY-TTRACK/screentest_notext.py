@@ -37,12 +37,7 @@ def init_display():
     time.sleep(0.1)
 
     # Initialize display
-    for cmd in JD9613.CMD:
-        send_command(cmd[0])
-        for param in cmd[1]:
-            send_data(param)
-        if cmd[2] & 0x80:
-            time.sleep(0.12)
+    JD9613.init(spi, tft_cs, tft_dc)
 
     # Turn on backlight
     tft_bl.value(1)
@@ -0,0 +1,230 @@
+# shapes.py
+# Vector primitives for the JD9613 built from horizontal/vertical spans.
+# Neighbouring spans with the same extent are merged so each one becomes a
+# single fill_rect window instead of a pixel at a time. The target d can be
+# screentest_m itself or anything with the same fill_rect, like a
+# BackBuffer or BandRenderer.
+import screentest_m as tft
+
+def hline(x, y, w, color, d=tft):
+    d.fill_rect(x, y, w, 1, color)
+
+def vline(x, y, h, color, d=tft):
+    d.fill_rect(x, y, 1, h, color)
+
+def rect(x, y, w, h, color, d=tft):
+    if w <= 0 or h <= 0:
+        return
+    d.fill_rect(x, y, w, 1, color)
+    if h > 1:
+        d.fill_rect(x, y + h - 1, w, 1, color)
+    if h > 2:
+        d.fill_rect(x, y + 1, 1, h - 2, color)
+        if w > 1:
+            d.fill_rect(x + w - 1, y + 1, 1, h - 2, color)
+
+def line(x0, y0, x1, y1, color, d=tft):
+    """Bresenham line, sent as one run per row (shallow) or column (steep)"""
+    if y0 == y1:
+        d.fill_rect(min(x0, x1), y0, abs(x1 - x0) + 1, 1, color)
+        return
+    if x0 == x1:
+        d.fill_rect(x0, min(y0, y1), 1, abs(y1 - y0) + 1, color)
+        return
+    steep = abs(y1 - y0) > abs(x1 - x0)
+    if steep:
+        x0, y0, x1, y1 = y0, x0, y1, x1
+    if x0 > x1:
+        x0, y0, x1, y1 = x1, y1, x0, y0
+    dx = x1 - x0
+    dy = abs(y1 - y0)
+    step = 1 if y0 < y1 else -1
+    err = dx >> 1
+    y = y0
+    start = x0
+    for x in range(x0, x1 + 1):
+        err -= dy
+        if err < 0 or x == x1:
+            # End of the run on this row/column
+            if steep:
+                d.fill_rect(y, start, 1, x - start + 1, color)
+            else:
+                d.fill_rect(start, y, x - start + 1, 1, color)
+            y += step
+            err += dx
+            start = x + 1
+
+def _half_widths(r):
+    """Half width of a radius r disc for each row offset 0..r"""
+    hw = bytearray(r + 2) if r < 255 else [0] * (r + 2)
+    x = r
+    limit = r * r + r
+    for dy in range(r + 1):
+        while x * x + dy * dy > limit:
+            x -= 1
+        hw[dy] = x
+    return hw
+
+def _groups(values, start, end):
+    """Yield (index, count, value) for runs of equal values[start..end-1]"""
+    for i in range(start + 1, end + 1):
+        if i == end or values[i] != values[start]:
+            yield start, i - start, values[start]
+            start = i
+
+def fill_circle(cx, cy, r, color, d=tft):
+    hw = _half_widths(r)
+    for dy, rows, w in _groups(hw, 0, r + 1):
+        if dy == 0:
+            # Middle band covers both halves
+            d.fill_rect(cx - w, cy - rows + 1, 2 * w + 1, 2 * rows - 1, color)
+        else:
+            d.fill_rect(cx - w, cy + dy, 2 * w + 1, rows, color)
+            d.fill_rect(cx - w, cy - dy - rows + 1, 2 * w + 1, rows, color)
+
+def _arc_rows(r):
+    """Outline of one quadrant: for each row offset 0..r the row covers x
+    offsets inner[dy]..outer[dy]"""
+    hw = _half_widths(r)
+    inner = bytearray(r + 1) if r < 255 else [0] * (r + 1)
+    for dy in range(r + 1):
+        nxt = hw[dy + 1] if dy < r else -1
+        inner[dy] = min(nxt + 1, hw[dy])
+    return inner, hw
+
+def _arc_spans(r):
+    """Outline spans of one quadrant as (dy, rows, inner, outer) groups,
+    the row covers x offsets inner..outer"""
+    inner, hw = _arc_rows(r)
+    spans = []
+    start = 0
+    for dy in range(1, r + 2):
+        if dy == r + 1 or hw[dy] != hw[start] or inner[dy] != inner[start]:
+            spans.append((start, dy - start, inner[start], hw[start]))
+            start = dy
+    return spans
+
+def circle(cx, cy, r, color, d=tft):
+    for dy, rows, a, b in _arc_spans(r):
+        w = b - a + 1
+        if a == 0:
+            # Left and right spans meet at the middle
+            xs = cx - b
+            w = 2 * b + 1
+            d.fill_rect(xs, cy + dy, w, rows, color)
+            d.fill_rect(xs, cy - dy - rows + 1, w, rows, color)
+            continue
+        if dy == 0:
+            top = cy - rows + 1
+            h = 2 * rows - 1
+            d.fill_rect(cx + a, top, w, h, color)
+            d.fill_rect(cx - b, top, w, h, color)
+            continue
+        for y in (cy + dy, cy - dy - rows + 1):
+            d.fill_rect(cx + a, y, w, rows, color)
+            d.fill_rect(cx - b, y, w, rows, color)
+
+def fill_round_rect(x, y, w, h, r, color, d=tft):
+    r = min(r, w // 2, h // 2)
+    if r <= 0:
+        d.fill_rect(x, y, w, h, color)
+        return
+    hw = _half_widths(r)
+    if h > 2 * r:
+        d.fill_rect(x, y + r, w, h - 2 * r, color)
+    inner = w - 2 * r
+    for dy, rows, cw in _groups(hw, 1, r + 1):
+        # Rows r - dy - rows + 1 .. r - dy from the top edge
+        top = r - dy - rows + 1
+        span = inner + 2 * cw
+        left = x + r - cw
+        d.fill_rect(left, y + top, span, rows, color)
+        d.fill_rect(left, y + h - 1 - (r - dy), span, rows, color)
+
+def round_rect(x, y, w, h, r, color, d=tft):
+    """Outline built row by row from the corner arcs and straight edges.
+    Where they meet, or the corners touch because w or h is close to 2r,
+    the spans are merged so every pixel goes out once, and rows with the
+    same spans share one fill_rect."""
+    r = min(r, w // 2, h // 2)
+    if r <= 0:
+        rect(x, y, w, h, color, d)
+        return
+    inner, outer = _arc_rows(r)
+    # Corner centres, the straight edges run between them
+    lx = x + r
+    rx = x + w - 1 - r
+    ty = y + r
+    by = y + h - 1 - r
+    bottom = y + h - 1
+    prev = None
+    prev_y = y
+    for row in range(y, bottom + 2):
+        spans = None
+        if row <= bottom:
+            spans = []
+            for dy in (ty - row, row - by):
+                if 0 <= dy <= r:
+                    spans.append((lx - outer[dy], lx - inner[dy]))
+                    spans.append((rx + inner[dy], rx + outer[dy]))
+            if row == y or row == bottom:
+                spans.append((lx + 1, rx - 1))
+            if not spans:
+                spans = [(x, x), (x + w - 1, x + w - 1)]
+            spans = _merge_spans(spans)
+        if spans != prev:
+            if prev:
+                for a, b in prev:
+                    d.fill_rect(a, prev_y, b - a + 1, row - prev_y, color)
+            prev = spans
+            prev_y = row
+
+def _merge_spans(spans):
+    """Sort inclusive (a, b) spans, drop empty ones and join any that
+    overlap or touch"""
+    spans.sort()
+    out = []
+    for a, b in spans:
+        if b < a:
+            continue
+        if out and a <= out[-1][1] + 1:
+            if b > out[-1][1]:
+                out[-1] = (out[-1][0], b)
+        else:
+            out.append((a, b))
+    return out
+
+def fill_polygon(points, color, d=tft):
+    """Even-odd fill of [(x, y), ...], rows with the same spans are merged"""
+    n = len(points)
+    ys = [p[1] for p in points]
+    prev = None
+    prev_y = 0
+    xs = []
+    for y in range(min(ys), max(ys) + 1):
+        # Edge crossings at the pixel centre y + 0.5, in doubled coordinates
+        xs.clear()
+        yc = 2 * y + 1
+        for i in range(n):
+            ax, ay = points[i]
+            bx, by = points[i - 1]
+            if ay > by:
+                ax, ay, bx, by = bx, by, ax, ay
+            if 2 * ay <= yc < 2 * by:
+                num = (yc - 2 * ay) * (bx - ax)
+                den = 2 * (by - ay)
+                xs.append(ax + (num + den // 2) // den)
+        xs.sort()
+        spans = tuple(xs)
+        if spans != prev:
+            if prev:
+                _fill_spans(prev, prev_y, y - prev_y, color, d)
+            prev = spans
+            prev_y = y
+    if prev:
+        _fill_spans(prev, prev_y, max(ys) + 1 - prev_y, color, d)
+
+def _fill_spans(xs, y, rows, color, d):
+    for i in range(0, len(xs) - 1, 2):
+        if xs[i + 1] > xs[i]:
+            d.fill_rect(xs[i], y, xs[i + 1] - xs[i], rows, color)
@@ -0,0 +1,90 @@
+# sprite.py
+# Sprites drawn on top of a BackBuffer. The back buffer is the off-screen
+# copy of what is under the sprite, so moving it restores the old spot and
+# draws the new one without touching the back buffer contents.
+import framebuf
+import screentest_m as tft
+
+class Sprite:
+    def __init__(self, bb, w, h, color=0xFFFF, fb=None, key=-1):
+        """Solid w x h block of color, or a panel ordered RGB565 fb with
+        transparent key color"""
+        self.bb = bb
+        self.w = w
+        self.h = h
+        self.x = 0
+        self.y = 0
+        self.visible = False
+        self._color = tft.swap565(color)
+        self._fb = fb
+        self._key = key
+        # Big enough for the union of two overlapping positions. Rows are
+        # always 2 * w pixels apart so one FrameBuffer covers any union.
+        self._stride = 2 * w
+        self._buf = bytearray(4 * w * h * 2)
+        self._mv = memoryview(self._buf)
+        self._scratch = framebuf.FrameBuffer(self._buf, 2 * w, 2 * h, framebuf.RGB565)
+        bb.sprites.append(self)
+
+    def move(self, x, y):
+        """Move to x, y. Overlapping old and new spots go out in one write"""
+        ox = self.x
+        oy = self.y
+        was_visible = self.visible
+        self.x = x
+        self.y = y
+        self.visible = True
+        if not was_visible:
+            self._push(x, y, x + self.w - 1, y + self.h - 1)
+        elif (x < ox + self.w and ox < x + self.w and
+                y < oy + self.h and oy < y + self.h):
+            self._push(min(x, ox), min(y, oy),
+                       max(x, ox) + self.w - 1, max(y, oy) + self.h - 1)
+        else:
+            self._push(ox, oy, ox + self.w - 1, oy + self.h - 1)
+            self._push(x, y, x + self.w - 1, y + self.h - 1)
+
+    def show(self):
+        self.visible = True
+        self.refresh()
+
+    def hide(self):
+        self.visible = False
+        self.refresh()
+
+    def refresh(self):
+        """Repaint the sprite's spot, e.g. after the back buffer under it changed"""
+        self._push(self.x, self.y, self.x + self.w - 1, self.y + self.h - 1)
+
+    def overlaps(self, x0, y0, x1, y1):
+        return (self.x <= x1 and x0 < self.x + self.w and
+                self.y <= y1 and y0 < self.y + self.h)
+
+    def _push(self, x0, y0, x1, y1):
+        """Compose back buffer pixels plus the sprite for a rect and send it"""
+        bb = self.bb
+        x0 = max(x0, 0)
+        y0 = max(y0, 0)
+        x1 = min(x1, bb.width - 1)
+        y1 = min(y1, bb.height - 1)
+        w = x1 - x0 + 1
+        h = y1 - y0 + 1
+        if w <= 0 or h <= 0:
+            return
+        row_bytes = w * 2
+        src = (y0 * bb.width + x0) * 2
+        src_step = bb.width * 2
+        dst = 0
+        dst_step = self._stride * 2
+        for _ in range(h):
+            self._mv[dst:dst + row_bytes] = bb._mv[src:src + row_bytes]
+            dst += dst_step
+            src += src_step
+        if self.visible:
+            # Drawn into the w x h corner of the scratch, clipped by its size
+            fb = self._scratch
+            if self._fb is None:
+                fb.fill_rect(self.x - x0, self.y - y0, self.w, self.h, self._color)
+            else:
+                fb.blit(self._fb, self.x - x0, self.y - y0, self._key)
+        tft.blit_buffer(self._mv, x0, y0, w, h, self._stride)
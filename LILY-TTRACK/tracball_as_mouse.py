@@ -1,7 +1,9 @@
 #circuitpython
 
 import board
+import countio
 import digitalio
+import keypad
 import usb_hid
 from adafruit_hid.mouse import Mouse
 from time import sleep
@@ -9,73 +11,47 @@ from time import sleep
 # Initialize the mouse
 mouse = Mouse(usb_hid.devices)
 
-# Set up trackball pins
-gs1 = digitalio.DigitalInOut(board.IO1)  # Left
-gs1.direction = digitalio.Direction.INPUT
-gs1.pull = digitalio.Pull.DOWN
+# Set up trackball pins. Each hall sensor gets a hardware pulse counter
+# (the S3 has exactly four), so edges are counted in the core even when
+# the loop below is busy or asleep.
+left = countio.Counter(board.IO1, edge=countio.Edge.RISE, pull=digitalio.Pull.DOWN)
+down = countio.Counter(board.IO2, edge=countio.Edge.RISE, pull=digitalio.Pull.DOWN)
+right = countio.Counter(board.IO3, edge=countio.Edge.RISE, pull=digitalio.Pull.DOWN)
+up = countio.Counter(board.IO10, edge=countio.Edge.RISE, pull=digitalio.Pull.DOWN)
 
-gs2 = digitalio.DigitalInOut(board.IO2)  # Down
-gs2.direction = digitalio.Direction.INPUT
-gs2.pull = digitalio.Pull.DOWN
-
-gs3 = digitalio.DigitalInOut(board.IO3)  # Right
-gs3.direction = digitalio.Direction.INPUT
-gs3.pull = digitalio.Pull.DOWN
-
-gs4 = digitalio.DigitalInOut(board.IO10)  # Up
-gs4.direction = digitalio.Direction.INPUT
-gs4.pull = digitalio.Pull.DOWN
-
-gs0 = digitalio.DigitalInOut(board.IO0)  # Up
-gs0.direction = digitalio.Direction.INPUT
-gs0.pull = digitalio.Pull.UP
+# Button is scanned and debounced by keypad, pulled up and low when pressed
+keys = keypad.Keys((board.IO0,), value_when_pressed=False, pull=True)
 
 # Movement settings
-MOVE_DISTANCE = 15  # Adjust this value to change sensitivity
-DELAY = 0.001      # Adjust this value to change response speed
+MOVE_DISTANCE = 15  # Pixels per sensor edge, adjust to change sensitivity
+TICK = 0.008        # One report every 8 ms (125 Hz)
 
-# Previous states
-prev_states = {
-    'left': False,
-    'right': False,
-    'up': False,
-    'down': False,
-    'key': True
-}
+counters = (left, right, up, down)
+last = [c.count for c in counters]
+x = 0
+y = 0
 
 while True:
-    x = 0
-    y = 0
-    k = False
-    
-    # Current states
-    curr_states = {
-        'left': gs1.value,
-        'right': gs3.value,
-        'up': gs4.value,
-        'down': gs2.value,
-        'key': gs0.value
-    }
-    
-    # Check for state changes and move accordingly
-    if curr_states['left'] != prev_states['left'] and curr_states['left']:
-        x = -MOVE_DISTANCE
-    if curr_states['right'] != prev_states['right'] and curr_states['right']:
-        x = MOVE_DISTANCE
-    if curr_states['up'] != prev_states['up'] and curr_states['up']:
-        y = -MOVE_DISTANCE
-    if curr_states['down'] != prev_states['down'] and curr_states['down']:
-        y = +MOVE_DISTANCE
-    if curr_states['key'] != prev_states['key']:
-        k = not curr_states['key']
-        
-        
-    # Move mouse if there's any input
-    if x != 0 or y != 0:
-        mouse.move(x=x, y=y)
-    if k:
-        mouse.click(Mouse.LEFT_BUTTON)
-    
-    # Update previous states
-    prev_states = curr_states.copy()
-    sleep(DELAY)
\ No newline at end of file
+    # Counts since the last tick. The counters are never reset, so no edge
+    # can slip in between reading and clearing.
+    counts = [c.count for c in counters]
+    x += (counts[1] - last[1] - counts[0] + last[0]) * MOVE_DISTANCE
+    y += (counts[3] - last[3] - counts[2] + last[2]) * MOVE_DISTANCE
+    last = counts
+
+    event = keys.events.get()
+    if event:
+        # Button reports carry no movement, that goes out next tick
+        if event.pressed:
+            mouse.press(Mouse.LEFT_BUTTON)
+        else:
+            mouse.release(Mouse.LEFT_BUTTON)
+    elif x or y:
+        # One report per tick, more than fits in a report waits for the next
+        dx = max(-127, min(127, x))
+        dy = max(-127, min(127, y))
+        mouse.move(x=dx, y=dy)
+        x -= dx
+        y -= dy
+
+    sleep(TICK)
@@ -1,9 +1,43 @@
 # trackball.py
-from machine import Pin
-from time import ticks_ms, ticks_diff
+from machine import Pin, mem32
+from time import ticks_ms, ticks_us, ticks_diff
+from array import array
+from micropython import const
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+# ESP32-S3 GPIO_IN register, one bit per GPIO 0..31
+GPIO_IN_REG = const(0x6000403C)
+GS1_BIT = const(1 << 1)
+GS2_BIT = const(1 << 2)
+GS3_BIT = const(1 << 3)
+GS4_BIT = const(1 << 10)
+KEY_BIT = const(1 << 0)
+GPIO_MASK = const(0x40F)
+
+try:
+    from fastgpio import read_gpio_in
+except (ImportError, SyntaxError):
+    def read_gpio_in():
+        return mem32[GPIO_IN_REG] & GPIO_MASK
+
+# Edge codes in the IRQ ring buffer
+EV_GS1 = 0
+EV_GS2 = 1
+EV_GS3 = 2
+EV_GS4 = 3
+EV_KEY = 4  # + button level
+
+# Event types from Trackball.events()
+EVENT_MOVE = 0
+EVENT_BUTTON = 1  # dx is the button level
 
 class Trackball:
-    def __init__(self):
+    def __init__(self, read_gpio=None):
+        """read_gpio: function returning the GPIO_IN bits for the fast
+        sampler, defaults to the real register"""
         self._pins = {
             'gs1': Pin(1, Pin.IN, Pin.PULL_DOWN),  # y down
             'gs2': Pin(2, Pin.IN, Pin.PULL_DOWN),  # x right
@@ -31,12 +65,111 @@ class Trackball:
         }
         self._last_button_state = self._pins['gsKey'].value()
 
-    def init(self, poll_interval_ms=10, aggregation_interval_ms=100):
-        """Initialize trackball with specified intervals"""
+        self._read_gpio = read_gpio or read_gpio_in
+        self._fast = False
+        self._prev_bits = 0
+
+        # Adaptive aggregation and acceleration
+        self._adaptive = False
+        self._accel = None
+        self._rem_x = 0
+        self._rem_y = 0
+        self._last_emit_us = 0
+        self._draw_us = 0
+
+        self._use_irq = False
+        self._ring_codes = None
+        self._ring_times = None
+        self._ring_head = 0
+        self._ring_tail = 0
+        self.overflows = 0
+        self.last_event_ms = 0
+        self._last_button_ms = 0
+        # ThreadSafeFlag set by the IRQ handlers while events() is waiting
+        self._wake = None
+
+    def init(self, poll_interval_ms=10, aggregation_interval_ms=100, use_irq=False, ring_size=64,
+             fast_sample=False, adaptive=False):
+        """Initialize trackball with specified intervals. With use_irq the pins
+        are not polled, pin interrupts queue every edge in a ring buffer of
+        ring_size entries and update() drains it. fast_sample polls all pins
+        with one GPIO_IN read instead of five Pin.value() calls. adaptive
+        replaces the fixed aggregation interval: a move is reported as soon
+        as it is seen, and only coalesced while moves keep arriving sooner
+        after the last callback than that callback took to draw."""
         self._poll_interval = poll_interval_ms
         self._aggregation_interval = aggregation_interval_ms
         self._last_poll = ticks_ms()
         self._last_aggregation = ticks_ms()
+        self.set_adaptive(adaptive)
+        self._fast = fast_sample
+        if fast_sample:
+            self._prev_bits = self._read_gpio()
+        if use_irq:
+            self._start_irq(ring_size)
+
+    def _start_irq(self, ring_size):
+        # Preallocated so the handlers never allocate
+        self._ring_codes = array('B', bytes(ring_size))
+        self._ring_times = array('L', [0] * ring_size)
+        self._ring_head = 0
+        self._ring_tail = 0
+        self._use_irq = True
+        for code, name in ((EV_GS1, 'gs1'), (EV_GS2, 'gs2'), (EV_GS3, 'gs3'), (EV_GS4, 'gs4')):
+            self._pins[name].irq(handler=lambda pin, code=code: self._push(code),
+                                 trigger=Pin.IRQ_RISING, hard=True)
+        self._pins['gsKey'].irq(handler=lambda pin: self._push(EV_KEY + pin.value()),
+                                trigger=Pin.IRQ_RISING | Pin.IRQ_FALLING, hard=True)
+
+    def stop_irq(self):
+        """Back to polling"""
+        for pin in self._pins.values():
+            pin.irq(handler=None)
+        self._use_irq = False
+
+    def _push(self, code):
+        """IRQ handler: queue an edge, dropping it if the ring is full"""
+        head = self._ring_head
+        nxt = head + 1
+        if nxt == len(self._ring_codes):
+            nxt = 0
+        if nxt == self._ring_tail:
+            self.overflows += 1
+            return
+        self._ring_codes[head] = code
+        self._ring_times[head] = ticks_ms()
+        self._ring_head = nxt
+        if self._wake is not None:
+            self._wake.set()
+
+    def pending(self):
+        """Number of queued edges in IRQ mode"""
+        n = self._ring_head - self._ring_tail
+        return n + len(self._ring_codes) if n < 0 else n
+
+    def _drain(self):
+        """Apply queued edges in order"""
+        codes = self._ring_codes
+        tail = self._ring_tail
+        while tail != self._ring_head:
+            code = codes[tail]
+            self.last_event_ms = self._ring_times[tail]
+            if code == EV_GS2:  # x right
+                self._delta_x += 1
+            elif code == EV_GS4:  # x left
+                self._delta_x -= 1
+            elif code == EV_GS3:  # y down
+                self._delta_y -= 1
+            elif code == EV_GS1:  # y up
+                self._delta_y += 1
+            elif ticks_diff(self.last_event_ms, self._last_button_ms) >= self._poll_interval:
+                # Closer key edges are contact bounce, the poll in update()
+                # picks up the level they settle on
+                self._set_button(code - EV_KEY)
+            tail += 1
+            if tail == len(codes):
+                tail = 0
+        self._ring_tail = tail
 
     def on_move(self, callback):
         """Set callback for movement events"""
@@ -46,6 +179,64 @@ class Trackball:
         """Set callback for button events"""
         self._on_button_callback = callback
 
+    def set_adaptive(self, adaptive=True):
+        """Switch between adaptive and fixed interval aggregation, see init()"""
+        self._adaptive = adaptive
+        self._last_emit_us = ticks_us()
+        self._draw_us = 0
+
+    def set_acceleration(self, curve):
+        """curve: ((speed, gain), ...) sorted by speed in counts per second,
+        gain in 1/16 steps (16 = 1x). The last entry at or below the measured
+        speed applies. None turns acceleration off."""
+        self._accel = curve
+        self._rem_x = 0
+        self._rem_y = 0
+
+    def _accelerate(self, dx, dy, dt_us):
+        """Scale a delta by the curve, keeping the fractions for next time"""
+        speed = (abs(dx) + abs(dy)) * 1000000 // max(dt_us, 1)
+        gain = 16
+        for min_speed, g in self._accel:
+            if speed < min_speed:
+                break
+            gain = g
+        x = dx * gain + self._rem_x
+        y = dy * gain + self._rem_y
+        # Floor division by 16, the remainder carries over in either direction
+        self._rem_x = x & 15
+        self._rem_y = y & 15
+        return x >> 4, y >> 4
+
+    def _emit_adaptive(self):
+        now = ticks_us()
+        since = ticks_diff(now, self._last_emit_us)
+        if since < self._draw_us:
+            # Moves are coming in faster than the last one took to draw,
+            # keep coalescing so drawing can't starve the rest of the loop
+            return
+        dx = self._delta_x
+        dy = self._delta_y
+        self._delta_x = 0
+        self._delta_y = 0
+        if self._accel:
+            dx, dy = self._accelerate(dx, dy, since)
+            if dx == 0 and dy == 0:
+                return
+        self._on_move_callback((dx, dy))
+        end = ticks_us()
+        self._draw_us = ticks_diff(end, now)
+        self._last_emit_us = end
+
+    def events(self, queue_size=16):
+        """Async iterator of (type, dx, dy, t_ms) tuples:
+
+            async for ev, dx, dy, t in trackball.events():
+
+        Takes over the move and button callbacks. In IRQ mode it sleeps until
+        an edge comes in, otherwise it polls every poll_interval_ms."""
+        return TrackballEvents(self, queue_size)
+
     def get_delta(self):
         """Get current accumulated delta"""
         return (self._delta_x, self._delta_y)
@@ -72,10 +263,30 @@ class Trackball:
         # Update previous states
         self._prev_states = current_states
 
+    def _sample_fast(self):
+        """Same as _update_delta plus _check_button from one register read,
+        previous state kept as a bitmask so nothing is allocated"""
+        cur = self._read_gpio()
+        rising = cur & ~self._prev_bits
+        self._prev_bits = cur
+        if rising:
+            if rising & GS2_BIT:  # x right
+                self._delta_x += 1
+            if rising & GS4_BIT:  # x left
+                self._delta_x -= 1
+            if rising & GS3_BIT:  # y down
+                self._delta_y -= 1
+            if rising & GS1_BIT:  # y up
+                self._delta_y += 1
+        self._set_button(1 if cur & KEY_BIT else 0)
+
     def _check_button(self):
         """Check button state and trigger callback if changed"""
-        current_state = self._pins['gsKey'].value()
+        self._set_button(self._pins['gsKey'].value())
+
+    def _set_button(self, current_state):
         if current_state != self._last_button_state:
+            self._last_button_ms = ticks_ms()
             if self._on_button_callback:
                 self._on_button_callback(current_state)
             self._last_button_state = current_state
@@ -84,16 +295,88 @@ class Trackball:
         """Main update function - should be called in the main loop"""
         current_time = ticks_ms()
 
+        if self._use_irq:
+            self._drain()
+
         # Check if it's time to poll inputs
         if ticks_diff(current_time, self._last_poll) >= self._poll_interval:
-            self._update_delta()
-            self._check_button()
+            if self._use_irq:
+                self._check_button()
+            elif self._fast:
+                self._sample_fast()
+            else:
+                self._update_delta()
+                self._check_button()
             self._last_poll = current_time
 
+        if self._adaptive:
+            if (self._delta_x != 0 or self._delta_y != 0) and self._on_move_callback:
+                self._emit_adaptive()
         # Check if it's time to trigger movement callback
-        if ticks_diff(current_time, self._last_aggregation) >= self._aggregation_interval:
+        elif ticks_diff(current_time, self._last_aggregation) >= self._aggregation_interval:
             if (self._delta_x != 0 or self._delta_y != 0) and self._on_move_callback:
-                self._on_move_callback((self._delta_x, self._delta_y))
+                delta = (self._delta_x, self._delta_y)
+                if self._accel:
+                    dt = ticks_diff(current_time, self._last_aggregation) * 1000
+                    delta = self._accelerate(delta[0], delta[1], dt)
+                if delta != (0, 0):
+                    self._on_move_callback(delta)
                 self._delta_x = 0
                 self._delta_y = 0
             self._last_aggregation = current_time
+
+
+class TrackballEvents:
+    """Bounded event queue fed by the Trackball callbacks. When it is full a
+    move is merged into a queued move at the tail, otherwise the oldest event
+    is dropped and counted in dropped."""
+    def __init__(self, tb, size):
+        self.tb = tb
+        self._queue = [None] * size
+        self._head = 0
+        self._count = 0
+        self.dropped = 0
+        tb.on_move(self._on_move)
+        tb.on_button(self._on_button)
+        if tb._use_irq and hasattr(asyncio, 'ThreadSafeFlag'):
+            tb._wake = asyncio.ThreadSafeFlag()
+
+    def _put(self, ev):
+        q = self._queue
+        size = len(q)
+        if self._count == size:
+            last = q[(self._head + size - 1) % size]
+            if ev[0] == EVENT_MOVE and last[0] == EVENT_MOVE:
+                q[(self._head + size - 1) % size] = (EVENT_MOVE, last[1] + ev[1], last[2] + ev[2], ev[3])
+                return
+            self._head = (self._head + 1) % size
+            self._count -= 1
+            self.dropped += 1
+        q[(self._head + self._count) % size] = ev
+        self._count += 1
+
+    def _on_move(self, delta):
+        self._put((EVENT_MOVE, delta[0], delta[1], ticks_ms()))
+
+    def _on_button(self, level):
+        self._put((EVENT_BUTTON, level, 0, ticks_ms()))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        tb = self.tb
+        tb.update()
+        while not self._count:
+            if (tb._wake is not None and not (tb._delta_x or tb._delta_y) and
+                    tb._pins['gsKey'].value() == tb._last_button_state):
+                # Nothing half aggregated or bouncing, sleep until the next edge
+                await tb._wake.wait()
+            else:
+                await asyncio.sleep_ms(max(tb._poll_interval, 1))
+            tb.update()
+        ev = self._queue[self._head]
+        self._queue[self._head] = None
+        self._head = (self._head + 1) % len(self._queue)
+        self._count -= 1
+        return ev
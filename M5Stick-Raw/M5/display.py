@@ -1,6 +1,7 @@
 # m5stick_display.py
 import random
 import machine
+import struct
 import time
 import axp192
 import colors
@@ -32,6 +33,8 @@ class Display:
                                 dc=machine.Pin(23, machine.Pin.OUT),
                                 cs=machine.Pin(5, machine.Pin.OUT),
                                 buf=bytearray(2048))
+        # Chunk buffer for blit_file
+        self.chunk = bytearray(2048)
         
         # Set up button
         self.button = machine.Pin(37, machine.Pin.IN)
@@ -102,6 +105,23 @@ class Display:
             self.tft.text(message, 10, current_y, colors.WHITE, background_color)
             current_y += self.font_height + self.line_padding
 
+    def blit_file(self, path, x, y):
+        """Stream an RGB565 image made by tools/img2rgb565.py to the screen,
+        a few rows at a time through the fixed chunk buffer"""
+        with open(path, "rb") as f:
+            magic, w, h = struct.unpack("<4sHH", f.read(8))
+            if magic != b"R565":
+                raise ValueError("not an RGB565 image")
+            rows = max(1, len(self.chunk) // (w * 2))
+            mv = memoryview(self.chunk)
+            row = 0
+            while row < h:
+                n = min(rows, h - row)
+                chunk = mv[:n * w * 2]
+                f.readinto(chunk)
+                self.tft.blit_buffer(chunk, x, y + row, w, n)
+                row += n
+
     def next_message(self):
         """Switch to the next message in the rotation"""
         self.current_message = (self.current_message + 1) % len(self.messages)
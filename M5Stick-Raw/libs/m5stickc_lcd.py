@@ -1,4 +1,5 @@
 import framebuf
+import struct
 import time
 from machine import Pin, SPI, I2C
 from axp192 import AXP192
@@ -85,6 +86,27 @@ class ST7735(framebuf.FrameBuffer):
         self.write_cmd(0x2c)
         self.write_data(self.buffer)
 
+    def blit_file(self, path, x, y):
+        """Load an RGB565 image made by tools/img2rgb565.py into the frame
+        buffer one row at a time, call show() to send it"""
+        with open(path, "rb") as f:
+            magic, w, h = struct.unpack("<4sHH", f.read(8))
+            if magic != b"R565":
+                raise ValueError("not an RGB565 image")
+            row = bytearray(w * 2)
+            # Visible part of each image row
+            x0 = max(0, -x)
+            x1 = min(w, self.width - x)
+            for r in range(h):
+                f.readinto(row)
+                sy = y + r
+                if sy < 0 or x1 <= x0:
+                    continue
+                if sy >= self.height:
+                    break
+                start = (sy * self.width + x + x0) * 2
+                self.buffer[start:start + (x1 - x0) * 2] = row[x0 * 2:x1 * 2]
+
     def write_cmd(self, cmd):
         self.dc.off()
         self.cs.off()
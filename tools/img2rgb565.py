@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Convert images to raw RGB565 assets for blit_file() on the devices.
+
+Runs on the host and needs Pillow:
+    python img2rgb565.py splash.png splash.565 --size 126x294
+
+Format: b"R565", width and height as little endian uint16, then
+width * height pixels row by row, RGB565 high byte first (panel order),
+so the device can stream the file to the panel without touching it.
+
+With --rle the magic is b"RLE5" and the pixels are packets instead: a
+control byte c, then one pixel repeated (c & 0x7F) + 1 times when c & 0x80
+is set, else c + 1 literal pixels. Runs continue across rows.
+"""
+import argparse
+import struct
+
+MAGIC = b"R565"
+MAGIC_RLE = b"RLE5"
+# Shorter runs are cheaper as literals
+MIN_RUN = 3
+
+def rgb565(r, g, b):
+    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+
+def encode_rle(pixels):
+    """RLE packets for a list of RGB565 ints"""
+    out = bytearray()
+    literal = []
+
+    def flush_literal():
+        for k in range(0, len(literal), 128):
+            part = literal[k:k + 128]
+            out.append(len(part) - 1)
+            for c in part:
+                out.extend((c >> 8, c & 0xFF))
+        literal.clear()
+
+    i = 0
+    n = len(pixels)
+    while i < n:
+        c = pixels[i]
+        j = i + 1
+        while j < n and pixels[j] == c:
+            j += 1
+        count = j - i
+        if count < MIN_RUN:
+            literal.extend(pixels[i:j])
+        else:
+            flush_literal()
+            while count:
+                part = min(count, 128)
+                out.extend((0x80 | (part - 1), c >> 8, c & 0xFF))
+                count -= part
+        i = j
+    flush_literal()
+    return out
+
+def convert(src, dst, size=None, bg=(0, 0, 0), rle=False):
+    from PIL import Image
+
+    img = Image.open(src).convert("RGBA")
+    if size:
+        img = img.resize(size)
+    # Flatten transparency onto the background color
+    flat = Image.new("RGBA", img.size, bg + (255,))
+    flat.alpha_composite(img)
+    w, h = flat.size
+    pixels = [rgb565(r, g, b) for r, g, b, _ in flat.getdata()]
+    if rle:
+        magic = MAGIC_RLE
+        out = encode_rle(pixels)
+    else:
+        magic = MAGIC
+        out = bytearray(w * h * 2)
+        for i, c in enumerate(pixels):
+            out[2 * i] = c >> 8
+            out[2 * i + 1] = c & 0xFF
+    with open(dst, "wb") as f:
+        f.write(struct.pack("<4sHH", magic, w, h))
+        f.write(out)
+    return w, h, len(out) + 8
+
+def parse_size(text):
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+def parse_color(text):
+    c = int(text, 16)
+    return (c >> 16) & 0xFF, (c >> 8) & 0xFF, c & 0xFF
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("src", help="input image, anything Pillow can open")
+    parser.add_argument("dst", help="output .565 file")
+    parser.add_argument("--size", type=parse_size, help="resize to WxH first")
+    parser.add_argument("--bg", type=parse_color, default=(0, 0, 0),
+                        help="background for transparent pixels, hex RRGGBB")
+    parser.add_argument("--rle", action="store_true",
+                        help="run length encode, for blit_rle_file()")
+    args = parser.parse_args()
+    w, h, size = convert(args.src, args.dst, args.size, args.bg, args.rle)
+    print(f"{args.dst}: {w}x{h}, {size} bytes (raw {w * h * 2 + 8})")
+
+if __name__ == "__main__":
+    main()